@@ -1,9 +1,13 @@
 from flask import Flask
 from flask_cors import CORS
 from config import Config
+from utils.structured_logging import init_logging
+from utils.resilience import init_resilience
 
 app = Flask(__name__)
 app.config.from_object(Config)
+init_logging(app)
+init_resilience(app)
 
 # Configure CORS with specific settings
 # Get allowed origins from environment variable or use defaults
@@ -14,13 +18,14 @@ CORS(app, resources={
     r"/api/*": {
         "origins": allowed_origins,
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"],
+        "allow_headers": ["Content-Type", "Authorization", "If-Match", "X-Profile"],
+        "expose_headers": ["ETag", "X-Request-ID", "X-Profile-Skipped"],
         "supports_credentials": True
     }
 })
 
 # Import routes
-from routes import auth, trends, departments, categories, subcategories, users
+from routes import auth, trends, departments, categories, subcategories, users, dashboard, metrics, taxonomy
 
 # Register blueprints
 app.register_blueprint(auth.bp)
@@ -29,6 +34,9 @@ app.register_blueprint(departments.bp)
 app.register_blueprint(categories.bp)
 app.register_blueprint(subcategories.bp)
 app.register_blueprint(users.bp)
+app.register_blueprint(dashboard.bp)
+app.register_blueprint(metrics.bp)
+app.register_blueprint(taxonomy.bp)
 
 @app.route('/')
 def health_check():
@@ -9,3 +9,82 @@ class Config:
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-in-production')
     JWT_ALGORITHM = 'HS256'
     JWT_EXPIRATION_HOURS = 24
+    
+    # Stats precomputation for popular filter combinations
+    STATS_CACHE_CAPACITY = int(os.getenv('STATS_CACHE_CAPACITY', 64))
+    STATS_CACHE_SOFT_TTL_SECONDS = float(os.getenv('STATS_CACHE_SOFT_TTL_SECONDS', 30))
+    STATS_CACHE_HARD_TTL_SECONDS = float(os.getenv('STATS_CACHE_HARD_TTL_SECONDS', 300))
+    STATS_PRECOMPUTE_TOP_KEYS = int(os.getenv('STATS_PRECOMPUTE_TOP_KEYS', 8))
+    STATS_PRECOMPUTE_INTERVAL_SECONDS = float(os.getenv('STATS_PRECOMPUTE_INTERVAL_SECONDS', 10))
+    STATS_REFRESH_WORKERS = int(os.getenv('STATS_REFRESH_WORKERS', 2))
+    # How long a request waits for another worker computing the same missing key
+    STATS_MISS_WAIT_SECONDS = float(os.getenv('STATS_MISS_WAIT_SECONDS', 2))
+    
+    # Structured logging
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+    LOG_SAMPLE_RATES = os.getenv('LOG_SAMPLE_RATES', 'DEBUG=0.1')
+    
+    # Shared cache tier: 'sqlite' (host-wide file, default), 'redis' or 'memory'
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'sqlite').lower()
+    CACHE_SQLITE_PATH = os.getenv('CACHE_SQLITE_PATH')
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    CACHE_LOCAL_TTL_SECONDS = float(os.getenv('CACHE_LOCAL_TTL_SECONDS', 5))
+    CACHE_VERSION_CHECK_SECONDS = float(os.getenv('CACHE_VERSION_CHECK_SECONDS', 0))
+    
+    # Upstream (Supabase) resilience
+    SUPABASE_HTTP_TIMEOUT_SECONDS = float(os.getenv('SUPABASE_HTTP_TIMEOUT_SECONDS', 10))
+    REQUEST_BUDGET_SECONDS = float(os.getenv('REQUEST_BUDGET_SECONDS', 8))
+    UPSTREAM_CALL_TIMEOUT_SECONDS = float(os.getenv('UPSTREAM_CALL_TIMEOUT_SECONDS', 5))
+    UPSTREAM_MAX_CONCURRENCY = int(os.getenv('UPSTREAM_MAX_CONCURRENCY', 16))
+    UPSTREAM_READ_RETRIES = int(os.getenv('UPSTREAM_READ_RETRIES', 2))
+    UPSTREAM_RETRY_BASE_SECONDS = float(os.getenv('UPSTREAM_RETRY_BASE_SECONDS', 0.1))
+    UPSTREAM_RETRY_MAX_SECONDS = float(os.getenv('UPSTREAM_RETRY_MAX_SECONDS', 1))
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+    CIRCUIT_RESET_SECONDS = float(os.getenv('CIRCUIT_RESET_SECONDS', 30))
+    STATS_STALE_IF_ERROR_SECONDS = float(os.getenv('STATS_STALE_IF_ERROR_SECONDS', 600))
+    
+    # Trend change feed
+    CHANGE_FEED_RETENTION = int(os.getenv('CHANGE_FEED_RETENTION', 5000))
+    CHANGE_FEED_MAX_EVENTS = int(os.getenv('CHANGE_FEED_MAX_EVENTS', 1000))
+    CHANGE_FEED_CLOCK_SKEW_SECONDS = float(os.getenv('CHANGE_FEED_CLOCK_SKEW_SECONDS', 5))
+    CHANGE_FEED_MAX_CURSOR_AGE_SECONDS = float(os.getenv('CHANGE_FEED_MAX_CURSOR_AGE_SECONDS', 86400))
+    
+    # Columns compared against If-Match for optimistic concurrency on writes
+    TRENDS_VERSION_COLUMN = os.getenv('TRENDS_VERSION_COLUMN', 'updated_at')
+    USERS_VERSION_COLUMN = os.getenv('USERS_VERSION_COLUMN', 'updated_at')
+    
+    # Opt-in per-request profiling for admins (?__profile=1 or X-Profile: 1)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILE_DIR = os.getenv('PROFILE_DIR')
+    PROFILE_TOP_N = int(os.getenv('PROFILE_TOP_N', 25))
+    
+    # Filter facet counts
+    FACETS_CACHE_TTL_SECONDS = float(os.getenv('FACETS_CACHE_TTL_SECONDS', 60))
+    
+    # Admin review queue: priority = impact weight * impact_score + age weight * days pending + department weight
+    REVIEW_IMPACT_WEIGHT = float(os.getenv('REVIEW_IMPACT_WEIGHT', 1))
+    REVIEW_AGE_WEIGHT = float(os.getenv('REVIEW_AGE_WEIGHT', 0.1))
+    REVIEW_DEPARTMENT_WEIGHTS = os.getenv('REVIEW_DEPARTMENT_WEIGHTS', '')
+    REVIEW_BATCH_SIZE = int(os.getenv('REVIEW_BATCH_SIZE', 10))
+    REVIEW_MAX_BATCH_SIZE = int(os.getenv('REVIEW_MAX_BATCH_SIZE', 50))
+    REVIEW_LEASE_SECONDS = float(os.getenv('REVIEW_LEASE_SECONDS', 900))
+    # Extra candidates ranked beyond the batch size to absorb items leased by others
+    REVIEW_LEASE_SLACK = int(os.getenv('REVIEW_LEASE_SLACK', 10))
+    
+    # Taxonomy index (departments, categories, subcategories) refresh interval
+    TAXONOMY_TTL_SECONDS = float(os.getenv('TAXONOMY_TTL_SECONDS', 300))
+    # Minimum gap between forced reloads when a filter names an unknown value
+    TAXONOMY_RELOAD_INTERVAL_SECONDS = float(os.getenv('TAXONOMY_RELOAD_INTERVAL_SECONDS', 30))
+    
+    # Background prefetch of the next trends page
+    PREFETCH_ENABLED = os.getenv('PREFETCH_ENABLED', 'false').lower() == 'true'
+    PREFETCH_TTL_SECONDS = float(os.getenv('PREFETCH_TTL_SECONDS', 30))
+    PREFETCH_WORKERS = int(os.getenv('PREFETCH_WORKERS', 2))
+    PREFETCH_BUDGET = int(os.getenv('PREFETCH_BUDGET', 10))
+    PREFETCH_BUDGET_PER_MINUTE = float(os.getenv('PREFETCH_BUDGET_PER_MINUTE', 20))
+    PREFETCH_MAX_TRACKED_USERS = int(os.getenv('PREFETCH_MAX_TRACKED_USERS', 1000))
+    
+    # Page size for full-table scans; must not exceed PostgREST's max-rows (1000 by default)
+    SCAN_PAGE_SIZE = int(os.getenv('SCAN_PAGE_SIZE', 1000))
@@ -1,5 +1,6 @@
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
 from config import Config
+from utils.resilience import ResilientClient
 
 class Database:
     _instance = None
@@ -9,12 +10,13 @@ class Database:
             cls._instance = super(Database, cls).__new__(cls)
             cls._instance.client: Client = create_client(
                 Config.SUPABASE_URL,
-                Config.SUPABASE_KEY
+                Config.SUPABASE_KEY,
+                options=ClientOptions(postgrest_client_timeout=Config.SUPABASE_HTTP_TIMEOUT_SECONDS)
             )
         return cls._instance
     
     def get_client(self) -> Client:
         return self.client
 
-# Create a singleton instance
-db = Database().get_client()
+# Create a singleton instance; every query goes through the deadline/retry/circuit layer
+db = ResilientClient(Database().get_client())
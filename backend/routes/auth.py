@@ -4,8 +4,11 @@ import jwt
 from datetime import datetime, timedelta
 from config import Config
 from database import db
+from utils.resilience import error_response
+from utils.structured_logging import get_logger
 
 bp = Blueprint('auth', __name__, url_prefix='/api/auth')
+logger = get_logger('auth')
 
 @bp.route('/login', methods=['POST'])
 def login():
@@ -14,35 +17,29 @@ def login():
         email = data.get('email')
         password = data.get('password')
         
-        print(f"DEBUG: Login attempt for email: {email}")
-        
         if not email or not password:
+            logger.info('auth.login_rejected', reason='missing_credentials')
             return jsonify({'error': 'Email and password are required'}), 400
         
         # Get user from database
         response = db.table('users').select('*').eq('email', email).execute()
         
-        print(f"DEBUG: Database response: {response.data}")
-        
         if not response.data or len(response.data) == 0:
-            print("DEBUG: User not found in database")
+            logger.info('auth.login_rejected', reason='unknown_user')
             return jsonify({'error': 'Invalid credentials'}), 401
         
         user = response.data[0]
-        print(f"DEBUG: User found: {user.get('email')}, is_active: {user.get('is_active')}")
         
         # Check if user is active (default to True if not set)
         if user.get('is_active') is False:
-            print("DEBUG: User account is inactive")
+            logger.info('auth.login_rejected', reason='inactive', user_id=user['id'])
             return jsonify({'error': 'Account is inactive'}), 401
         
         # Verify password
-        print(f"DEBUG: Verifying password...")
         password_match = bcrypt.checkpw(password.encode('utf-8'), user['password'].encode('utf-8'))
-        print(f"DEBUG: Password match: {password_match}")
         
         if not password_match:
-            print("DEBUG: Password verification failed")
+            logger.info('auth.login_rejected', reason='invalid_credentials', user_id=user['id'])
             return jsonify({'error': 'Invalid credentials'}), 401
         
         # Generate JWT token
@@ -52,6 +49,8 @@ def login():
             'exp': datetime.utcnow() + timedelta(hours=Config.JWT_EXPIRATION_HOURS)
         }, Config.JWT_SECRET_KEY, algorithm=Config.JWT_ALGORITHM)
         
+        logger.info('auth.login_succeeded', user_id=user['id'], user_type=user['user_type'])
+        
         return jsonify({
             'token': token,
             'user': {
@@ -64,7 +63,8 @@ def login():
         }), 200
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        logger.exception('auth.login_failed')
+        return error_response(e)
 
 @bp.route('/verify', methods=['GET'])
 def verify_token():
@@ -107,4 +107,4 @@ def verify_token():
     except jwt.InvalidTokenError:
         return jsonify({'error': 'Invalid token'}), 401
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from utils.auth_middleware import token_required
+from utils.resilience import error_response
+from utils.taxonomy import taxonomy_index
 from database import db
 
 bp = Blueprint('categories', __name__, url_prefix='/api/categories')
@@ -8,18 +10,13 @@ bp = Blueprint('categories', __name__, url_prefix='/api/categories')
 @token_required
 def get_categories(current_user):
     try:
-        query = db.table('categories').select('*')
+        # Served from the in-memory taxonomy index, optionally for one department
+        categories = taxonomy_index.categories(request.args.get('department') or None)
         
-        # Filter by department if provided
-        if request.args.get('department'):
-            query = query.eq('department', request.args.get('department'))
-        
-        response = query.execute()
-        
-        return jsonify({'categories': response.data}), 200
+        return jsonify({'categories': categories}), 200
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
 
 @bp.route('/<int:category_id>', methods=['GET'])
 @token_required
@@ -33,4 +30,4 @@ def get_category(current_user, category_id):
         return jsonify({'category': response.data[0]}), 200
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
@@ -0,0 +1,58 @@
+from flask import Blueprint, request, jsonify
+from utils.auth_middleware import token_required
+from utils.trend_queries import (
+    fetch_trend_stats,
+    filter_key,
+    format_trend_for_user,
+    parse_trend_filters,
+    visibility_scope
+)
+from utils.change_feed import current_cursor
+from utils.prefetch import fetch_page
+from utils.stats_cache import stats_scheduler
+from utils.taxonomy import InvalidFilter, taxonomy_index
+from utils.resilience import error_response
+
+bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
+
+@bp.route('', methods=['GET'])
+@token_required
+def get_dashboard(current_user):
+    """Trend page, total and stats for one filter set"""
+    try:
+        # Get pagination parameters
+        page = int(request.args.get('page', 1))
+        limit = int(request.args.get('limit', 10))
+
+        filters = taxonomy_index.normalise_filters(parse_trend_filters())
+        scope = visibility_scope(current_user)
+        key = filter_key(filters)
+
+        # Stats come from the precomputed cache or a paged, projected scan
+        stats = stats_scheduler.get(scope, key, lambda: fetch_trend_stats(current_user, filters))
+
+        # Read before the page so no change between the two is missed by the client
+        cursor = current_cursor()
+        
+        # Only the requested page carries the full rows; the total is an exact count.
+        # The page may come from a prefetch, and the next one is prefetched in turn
+        page_data = fetch_page(current_user, filters, scope, key, page, limit)
+        rows = page_data['rows']
+        total_count = page_data['total']
+
+        trends = [format_trend_for_user(trend, current_user) for trend in rows]
+
+        return jsonify({
+            'trends': trends,
+            'total': total_count,
+            'page': page,
+            'limit': limit,
+            'total_pages': (total_count + limit - 1) // limit,
+            'stats': stats,
+            'cursor': cursor
+        }), 200
+
+    except InvalidFilter as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return error_response(e)
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from utils.auth_middleware import token_required
+from utils.resilience import error_response
+from utils.taxonomy import taxonomy_index
 from database import db
 
 bp = Blueprint('departments', __name__, url_prefix='/api/departments')
@@ -8,18 +10,13 @@ bp = Blueprint('departments', __name__, url_prefix='/api/departments')
 @token_required
 def get_departments(current_user):
     try:
-        query = db.table('departments').select('*')
+        # Served from the in-memory taxonomy index
+        departments = taxonomy_index.departments(active_only=request.args.get('active_only') == 'true')
         
-        # Filter active departments
-        if request.args.get('active_only') == 'true':
-            query = query.eq('is_active', True)
-        
-        response = query.execute()
-        
-        return jsonify({'departments': response.data}), 200
+        return jsonify({'departments': departments}), 200
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
 
 @bp.route('/<department_id>', methods=['GET'])
 @token_required
@@ -33,4 +30,4 @@ def get_department(current_user, department_id):
         return jsonify({'department': response.data[0]}), 200
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
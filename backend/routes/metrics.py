@@ -0,0 +1,25 @@
+from flask import Blueprint, jsonify
+from utils.auth_middleware import token_required, admin_required
+from utils.cache import cache_metrics
+from utils.prefetch import page_prefetcher
+from utils.stats_cache import stats_scheduler
+from utils.resilience import error_response, upstream_metrics
+from utils.structured_logging import logging_metrics
+
+bp = Blueprint('metrics', __name__, url_prefix='/api/metrics')
+
+@bp.route('', methods=['GET'])
+@token_required
+@admin_required
+def get_metrics(current_user):
+    try:
+        return jsonify({
+            'stats_cache': stats_scheduler.metrics(),
+            'logging': logging_metrics(),
+            'cache': cache_metrics(),
+            'upstream': upstream_metrics(),
+            'prefetch': page_prefetcher.metrics()
+        }), 200
+        
+    except Exception as e:
+        return error_response(e)
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from utils.auth_middleware import token_required
+from utils.resilience import error_response
+from utils.taxonomy import taxonomy_index
 from database import db
 
 bp = Blueprint('subcategories', __name__, url_prefix='/api/subcategories')
@@ -8,18 +10,13 @@ bp = Blueprint('subcategories', __name__, url_prefix='/api/subcategories')
 @token_required
 def get_subcategories(current_user):
     try:
-        query = db.table('sub_categories').select('*')
+        # Served from the in-memory taxonomy index, optionally for one category
+        subcategories = taxonomy_index.subcategories(request.args.get('category_name') or None)
         
-        # Filter by category if provided
-        if request.args.get('category_name'):
-            query = query.eq('category_name', request.args.get('category_name'))
-        
-        response = query.execute()
-        
-        return jsonify({'subcategories': response.data}), 200
+        return jsonify({'subcategories': subcategories}), 200
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
 
 @bp.route('/<int:subcategory_id>', methods=['GET'])
 @token_required
@@ -33,4 +30,4 @@ def get_subcategory(current_user, subcategory_id):
         return jsonify({'subcategory': response.data[0]}), 200
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
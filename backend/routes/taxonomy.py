@@ -0,0 +1,33 @@
+from flask import Blueprint, request, jsonify
+from utils.auth_middleware import token_required
+from utils.taxonomy import InvalidFilter, taxonomy_index
+from utils.resilience import error_response
+
+bp = Blueprint('taxonomy', __name__, url_prefix='/api/taxonomy')
+
+@bp.route('', methods=['GET'])
+@token_required
+def get_taxonomy(current_user):
+    """Departments, categories and subcategories, flat and as a nested tree, in one call"""
+    try:
+        active_only = request.args.get('active_only') == 'true'
+        
+        # Expand a single category into its subcategories
+        if request.args.get('category'):
+            category = request.args.get('category')
+            return jsonify({
+                'category': category,
+                'subcategories': taxonomy_index.expand_category(category)
+            }), 200
+        
+        return jsonify({
+            'departments': taxonomy_index.departments(active_only),
+            'categories': taxonomy_index.categories(),
+            'subcategories': taxonomy_index.subcategories(),
+            'tree': taxonomy_index.tree(active_only)
+        }), 200
+        
+    except InvalidFilter as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return error_response(e)
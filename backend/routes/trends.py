@@ -1,8 +1,52 @@
 from flask import Blueprint, request, jsonify
 from utils.auth_middleware import token_required, admin_required
+from config import Config
+from utils.trend_queries import (
+    CHANGE_COLUMNS,
+    PENDING_STATUS,
+    STATS_FILTER_FIELDS,
+    TREND_FILTER_FIELDS,
+    apply_trend_filters,
+    fetch_trend_stats,
+    filter_key,
+    format_trend_for_user,
+    parse_trend_filters,
+    stats_delta,
+    visibility_scope
+)
+from utils.change_feed import (
+    InvalidCursor,
+    current_cursor,
+    iso_timestamp,
+    read_changes,
+    record_changes,
+    trend_change_event
+)
+from utils.mutations import (
+    NotFound,
+    PreconditionFailed,
+    conditional_delete,
+    conditional_update,
+    etag_for,
+    if_match_token
+)
+from utils.facets import facets_cache, fetch_facets
+from utils.prefetch import fetch_page, page_prefetcher
+from utils.review_queue import InvalidWeights, finish_review, next_batch, priority_weights, release_leases
+from utils.stats_cache import stats_scheduler
+from utils.taxonomy import InvalidFilter, taxonomy_index
+from utils.structured_logging import get_logger
+from utils.resilience import error_response
 from database import db
 
 bp = Blueprint('trends', __name__, url_prefix='/api/trends')
+logger = get_logger('trends')
+
+def invalidate_trend_views():
+    """Drop cached stats, facet counts and prefetched pages after trends change"""
+    stats_scheduler.invalidate()
+    facets_cache.invalidate()
+    page_prefetcher.invalidate()
 
 @bp.route('/debug', methods=['GET'])
 def debug_trends():
@@ -15,7 +59,7 @@ def debug_trends():
             'sample_id_type': type(response.data[0]['id']).__name__ if response.data else 'N/A'
         }), 200
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
 
 @bp.route('', methods=['GET'])
 @token_required
@@ -24,134 +68,16 @@ def get_trends(current_user):
         # Get pagination parameters
         page = int(request.args.get('page', 1))
         limit = int(request.args.get('limit', 10))
-        offset = (page - 1) * limit
-        
-        # Build query for data
-        query = db.table('trends').select('*')
-        
-        # Filter out trends with empty descriptions (only load complete trends)
-        # Check that at least one description field is not null/empty
-        query = query.or_('internal_teacher_description.neq.,internal_business_description.neq.,external_user_description.neq.')
-        count_query = db.table('trends').select('id', count='exact')
-        count_query = count_query.or_('internal_teacher_description.neq.,internal_business_description.neq.,external_user_description.neq.')
-        
-        # Non-admin users can only see confirmed trends
-        if current_user['user_type'] != 'admin':
-            query = query.eq('status', 'confirmed')
-            count_query = count_query.eq('status', 'confirmed')
-        
-        # Apply filters from query params
-        filters = request.args
-        
-        # Department/Sector filter - handle multiple values
-        department_names = filters.getlist('department_name')
-        if department_names:
-            if len(department_names) == 1:
-                query = query.eq('department_name', department_names[0])
-                count_query = count_query.eq('department_name', department_names[0])
-            else:
-                query = query.in_('department_name', department_names)
-                count_query = count_query.in_('department_name', department_names)
-        
-        # Category filter - handle multiple values
-        categories = filters.getlist('category')
-        if categories:
-            if len(categories) == 1:
-                query = query.eq('category', categories[0])
-                count_query = count_query.eq('category', categories[0])
-            else:
-                query = query.in_('category', categories)
-                count_query = count_query.in_('category', categories)
-        
-        # Subcategory filter - handle multiple values
-        sub_categories = filters.getlist('sub_category')
-        if sub_categories:
-            # sub_category is an array field, so we need to check if any of the selected values are in it
-            if len(sub_categories) == 1:
-                query = query.contains('sub_category', [sub_categories[0]])
-                count_query = count_query.contains('sub_category', [sub_categories[0]])
-            else:
-                # For multiple subcategories, we need to use OR logic
-                # Note: Supabase may require different syntax for array overlaps
-                query = query.overlaps('sub_category', sub_categories)
-                count_query = count_query.overlaps('sub_category', sub_categories)
-        
-        # Time Horizon filter - handle multiple values
-        time_horizons = filters.getlist('time_horizon')
-        if time_horizons:
-            if len(time_horizons) == 1:
-                query = query.eq('time_horizon', time_horizons[0])
-                count_query = count_query.eq('time_horizon', time_horizons[0])
-            else:
-                query = query.in_('time_horizon', time_horizons)
-                count_query = count_query.in_('time_horizon', time_horizons)
-        
-        # Scope filter - handle multiple values
-        scopes = filters.getlist('scope')
-        if scopes:
-            if len(scopes) == 1:
-                query = query.eq('scope', scopes[0])
-                count_query = count_query.eq('scope', scopes[0])
-            else:
-                query = query.in_('scope', scopes)
-                count_query = count_query.in_('scope', scopes)
-        
-        # Status filter - handle multiple values
-        statuses = filters.getlist('status')
-        if statuses:
-            if len(statuses) == 1:
-                query = query.eq('status', statuses[0])
-                count_query = count_query.eq('status', statuses[0])
-            else:
-                query = query.in_('status', statuses)
-                count_query = count_query.in_('status', statuses)
-        
-        # Impact Label filter - handle multiple values
-        impact_labels = filters.getlist('impact_label')
-        if impact_labels:
-            if len(impact_labels) == 1:
-                query = query.eq('impact_label', impact_labels[0])
-                count_query = count_query.eq('impact_label', impact_labels[0])
-            else:
-                query = query.in_('impact_label', impact_labels)
-                count_query = count_query.in_('impact_label', impact_labels)
-        
-        # Apply pagination and ordering
-        query = query.order('created_at', desc=True).range(offset, offset + limit - 1)
         
-        # Execute queries
-        count_response = count_query.execute()
-        data_response = query.execute()
+        filters = taxonomy_index.normalise_filters(parse_trend_filters())
+        scope = visibility_scope(current_user)
         
-        total_count = count_response.count if hasattr(count_response, 'count') else len(data_response.data)
+        # The previous page may already have prefetched this one
+        page_data = fetch_page(current_user, filters, scope, filter_key(filters), page, limit)
+        total_count = page_data['total']
         
         # Filter description based on user type
-        trends = []
-        for trend in data_response.data:
-            filtered_trend = trend.copy()
-            
-            # Select appropriate description based on user type
-            if current_user['user_type'] == 'admin':
-                # Admin sees all descriptions
-                filtered_trend['descriptions'] = {
-                    'internal_teacher': trend.get('internal_teacher_description'),
-                    'internal_business': trend.get('internal_business_description'),
-                    'external': trend.get('external_user_description')
-                }
-            elif current_user['user_type'] == 'internal_teacher':
-                filtered_trend['description'] = trend.get('internal_teacher_description')
-            elif current_user['user_type'] == 'internal_business':
-                filtered_trend['description'] = trend.get('internal_business_description')
-            elif current_user['user_type'] == 'external':
-                filtered_trend['description'] = trend.get('external_user_description')
-            
-            # Remove individual description fields
-            if current_user['user_type'] != 'admin':
-                filtered_trend.pop('internal_teacher_description', None)
-                filtered_trend.pop('internal_business_description', None)
-                filtered_trend.pop('external_user_description', None)
-            
-            trends.append(filtered_trend)
+        trends = [format_trend_for_user(trend, current_user) for trend in page_data['rows']]
         
         return jsonify({
             'trends': trends,
@@ -161,8 +87,69 @@ def get_trends(current_user):
             'total_pages': (total_count + limit - 1) // limit
         }), 200
         
+    except InvalidFilter as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
+
+def _review_batch(current_user, claim):
+    try:
+        limit = min(int(request.args.get('limit', Config.REVIEW_BATCH_SIZE)), Config.REVIEW_MAX_BATCH_SIZE)
+    except ValueError:
+        return jsonify({'error': 'limit must be a number'}), 400
+    if limit < 1:
+        return jsonify({'error': 'limit must be positive'}), 400
+    try:
+        weights = priority_weights(request.args)
+    except InvalidWeights as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Everything is pending here, so status is not a usable filter
+    try:
+        filters = taxonomy_index.normalise_filters(
+            parse_trend_filters(fields=[field for field in TREND_FILTER_FIELDS if field != 'status'])
+        )
+    except InvalidFilter as e:
+        return jsonify({'error': str(e)}), 400
+    batch = next_batch(current_user, filters, weights, limit, claim=claim)
+    return jsonify(batch), 200
+
+@bp.route('/review-queue', methods=['GET'])
+@token_required
+@admin_required
+def get_review_queue(current_user):
+    """Highest-priority pending trends not leased by another admin (does not lease)"""
+    try:
+        return _review_batch(current_user, claim=False)
+    except Exception as e:
+        return error_response(e)
+
+@bp.route('/review-queue/claim', methods=['POST'])
+@token_required
+@admin_required
+def claim_review_batch(current_user):
+    """Lease the next batch of pending trends to the caller for REVIEW_LEASE_SECONDS"""
+    try:
+        return _review_batch(current_user, claim=True)
+    except Exception as e:
+        return error_response(e)
+
+@bp.route('/review-queue/release', methods=['POST'])
+@token_required
+@admin_required
+def release_review_batch(current_user):
+    try:
+        data = request.get_json() or {}
+        trend_ids = data.get('trend_ids', [])
+        
+        if not trend_ids:
+            return jsonify({'error': 'trend_ids is required'}), 400
+        
+        released = release_leases(trend_ids, admin_id=current_user['id'])
+        return jsonify({'released': released}), 200
+        
+    except Exception as e:
+        return error_response(e)
 
 @bp.route('/<trend_id>', methods=['GET'])
 @token_required
@@ -204,47 +191,105 @@ def get_trend(current_user, trend_id):
         return jsonify({'trend': filtered_trend}), 200
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
 
 @bp.route('/<trend_id>/approve', methods=['PUT'])
 @token_required
 @admin_required
 def approve_trend(current_user, trend_id):
     try:
-        # Check if trend exists
-        existing = db.table('trends').select('id').eq('id', trend_id).execute()
-        if not existing.data or len(existing.data) == 0:
-            return jsonify({'error': 'Trend not found'}), 404
-        
-        # Update status to confirmed
-        response = db.table('trends').update({
+        if_match = if_match_token()
+        review = {
             'status': 'confirmed',
             'reviewed_by': current_user['id'],
             'reviewed_at': 'now()'
-        }).eq('id', trend_id).execute()
-        
-        return jsonify({'message': 'Trend approved successfully', 'trend': response.data[0]}), 200
+        }
         
+        # Approve a pending trend in one round trip; the status guard tells us what it was before
+        changed = True
+        try:
+            after = conditional_update(
+                'trends', {'id': trend_id, 'status': PENDING_STATUS}, review,
+                Config.TRENDS_VERSION_COLUMN, if_match, probe=False
+            )[0]
+            before = dict(after, status=PENDING_STATUS)
+        except NotFound:
+            # Not pending, or the version did not match: read the row once to find out which
+            existing = db.table('trends').select('*').eq('id', trend_id).execute()
+            if not existing.data or len(existing.data) == 0:
+                return jsonify({'error': 'Trend not found'}), 404
+            before = existing.data[0]
+            version = before.get(Config.TRENDS_VERSION_COLUMN)
+            if if_match is not None and version is not None and str(version) != if_match:
+                raise PreconditionFailed('The resource was modified by someone else; reload and try again')
+            if before.get('status') == 'confirmed':
+                # Approving twice is a no-op
+                after = before
+                changed = False
+            else:
+                # Guard on the state and version just read, so a concurrent change fails the UPDATE
+                token = if_match if if_match is not None else (str(version) if version is not None else None)
+                match = {'id': trend_id}
+                if before.get('status') is not None:
+                    match['status'] = before['status']
+                try:
+                    after = conditional_update(
+                        'trends', match, review,
+                        Config.TRENDS_VERSION_COLUMN, token, probe=False
+                    )[0]
+                except NotFound:
+                    raise PreconditionFailed('The resource was modified by someone else; reload and try again')
+        
+        if changed:
+            invalidate_trend_views()
+            cursor = record_changes([trend_change_event('update', before, after)])
+        else:
+            cursor = current_cursor()
+        finish_review([trend_id])
+        
+        response = jsonify({
+            'message': 'Trend approved successfully',
+            'trend': after,
+            'cursor': cursor,
+            'stats_delta': stats_delta([before], [after], current_user, parse_trend_filters())
+        })
+        etag = etag_for(after, Config.TRENDS_VERSION_COLUMN)
+        if etag:
+            response.headers['ETag'] = etag
+        return response, 200
+        
+    except PreconditionFailed as e:
+        return jsonify({'error': str(e)}), 412
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
 
 @bp.route('/<trend_id>/disapprove', methods=['DELETE'])
 @token_required
 @admin_required
 def disapprove_trend(current_user, trend_id):
     try:
-        # Check if trend exists
-        existing = db.table('trends').select('id').eq('id', trend_id).execute()
-        if not existing.data or len(existing.data) == 0:
+        # Delete in one round trip; the deleted row comes back for the stats delta
+        try:
+            before = conditional_delete(
+                'trends', {'id': trend_id}, Config.TRENDS_VERSION_COLUMN, if_match_token()
+            )[0]
+        except NotFound:
             return jsonify({'error': 'Trend not found'}), 404
         
-        # Delete the trend
-        db.table('trends').delete().eq('id', trend_id).execute()
+        invalidate_trend_views()
+        cursor = record_changes([trend_change_event('delete', before)])
+        finish_review([trend_id])
         
-        return jsonify({'message': 'Trend disapproved and deleted successfully'}), 200
+        return jsonify({
+            'message': 'Trend disapproved and deleted successfully',
+            'cursor': cursor,
+            'stats_delta': stats_delta([before], [None], current_user, parse_trend_filters())
+        }), 200
         
+    except PreconditionFailed as e:
+        return jsonify({'error': str(e)}), 412
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
 
 @bp.route('/bulk-approve', methods=['PUT'])
 @token_required
@@ -254,38 +299,60 @@ def bulk_approve_trends(current_user):
         data = request.get_json()
         trend_ids = data.get('trend_ids', [])
         
-        print(f"DEBUG: Bulk approve - received trend_ids: {trend_ids}")
-        print(f"DEBUG: Type of first ID: {type(trend_ids[0]) if trend_ids else 'N/A'}")
-        
         if not trend_ids:
             return jsonify({'error': 'trend_ids is required'}), 400
         
+        # Convert to int if it's a string number
+        trend_ids = [int(trend_id) if isinstance(trend_id, str) and trend_id.isdigit() else trend_id for trend_id in trend_ids]
+        
+        # Current state of every requested trend, for the stats delta
+        existing = db.table('trends').select(CHANGE_COLUMNS).in_('id', trend_ids).execute()
+        before_by_id = {row['id']: row for row in existing.data}
+        
         # Update all trends to confirmed
         approved_count = 0
+        before_rows = []
+        after_rows = []
         for trend_id in trend_ids:
             try:
-                # Convert to int if it's a string number
-                if isinstance(trend_id, str) and trend_id.isdigit():
-                    trend_id = int(trend_id)
-                
-                result = db.table('trends').update({
+                updated = conditional_update('trends', {'id': trend_id}, {
                     'status': 'confirmed',
                     'reviewed_by': current_user['id'],
                     'reviewed_at': 'now()'
-                }).eq('id', trend_id).execute()
+                }, Config.TRENDS_VERSION_COLUMN)
                 
-                print(f"DEBUG: Approved trend {trend_id}, result: {result.data}")
+                logger.debug('trends.bulk_approve_item', trend_id=trend_id, updated=len(updated))
                 approved_count += 1
+                for after in updated:
+                    if after['id'] in before_by_id:
+                        before_rows.append(before_by_id[after['id']])
+                        after_rows.append(after)
+            except NotFound:
+                logger.debug('trends.bulk_approve_item', trend_id=trend_id, updated=0)
+                continue
             except Exception as e:
-                print(f"DEBUG: Error approving trend {trend_id}: {str(e)}")
+                logger.warning('trends.bulk_approve_item_failed', trend_id=trend_id, error=str(e))
                 # Continue with other trends even if one fails
                 continue
         
-        return jsonify({'message': f'{approved_count} trends approved successfully'}), 200
+        if approved_count:
+            invalidate_trend_views()
+            finish_review([after['id'] for after in after_rows])
+        cursor = record_changes([
+            trend_change_event('update', before, after) for before, after in zip(before_rows, after_rows)
+        ])
+        
+        logger.info('trends.bulk_approved', requested=len(trend_ids), approved=approved_count, reviewed_by=current_user['id'])
+        
+        return jsonify({
+            'message': f'{approved_count} trends approved successfully',
+            'cursor': cursor,
+            'stats_delta': stats_delta(before_rows, after_rows, current_user, parse_trend_filters())
+        }), 200
         
     except Exception as e:
-        print(f"DEBUG: Bulk approve error: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        logger.exception('trends.bulk_approve_failed')
+        return error_response(e)
 
 @bp.route('/bulk-disapprove', methods=['DELETE'])
 @token_required
@@ -298,112 +365,136 @@ def bulk_disapprove_trends(current_user):
         if not trend_ids:
             return jsonify({'error': 'trend_ids is required'}), 400
         
-        # Delete all trends
-        for trend_id in trend_ids:
-            db.table('trends').delete().eq('id', trend_id).execute()
+        # Delete all trends; the deleted rows come back in the response
+        deleted_rows = []
+        cursor = None
+        try:
+            for trend_id in trend_ids:
+                response = db.table('trends').delete().eq('id', trend_id).execute()
+                deleted_rows.extend(response.data)
+        finally:
+            # Record whatever was deleted, even if a later delete failed
+            if deleted_rows:
+                invalidate_trend_views()
+                cursor = record_changes([trend_change_event('delete', row) for row in deleted_rows])
+                finish_review([row['id'] for row in deleted_rows])
+        
+        if not deleted_rows:
+            cursor = current_cursor()
         
-        return jsonify({'message': f'{len(trend_ids)} trends disapproved and deleted successfully'}), 200
+        return jsonify({
+            'message': f'{len(trend_ids)} trends disapproved and deleted successfully',
+            'cursor': cursor,
+            'stats_delta': stats_delta(deleted_rows, [None] * len(deleted_rows), current_user, parse_trend_filters())
+        }), 200
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
 
-@bp.route('/stats', methods=['GET'])
+@bp.route('/changes', methods=['GET'])
 @token_required
-def get_trend_stats(current_user):
+def get_trend_changes(current_user):
+    """Trends inserted, updated or deleted since a cursor, as visible to the caller's role"""
     try:
-        # Build query based on user type
-        query = db.table('trends').select('*')
-        
-        # Filter out trends with empty descriptions (only count complete trends)
-        query = query.or_('internal_teacher_description.neq.,internal_business_description.neq.,external_user_description.neq.')
-        
-        if current_user['user_type'] != 'admin':
-            query = query.eq('status', 'confirmed')
-        
-        # Apply filters from query params
-        filters = request.args
-        
-        # Department/Sector filter - handle multiple values
-        department_names = filters.getlist('department_name')
-        if department_names:
-            if len(department_names) == 1:
-                query = query.eq('department_name', department_names[0])
-            else:
-                query = query.in_('department_name', department_names)
+        filters = taxonomy_index.normalise_filters(parse_trend_filters())
+        since = request.args.get('since')
+        
+        if not since:
+            # Bootstrap: hand out a cursor for the state the client just loaded
+            return jsonify({'cursor': current_cursor(), 'inserted': [], 'updated': [], 'deleted': [], 'reset': False}), 200
+        
+        try:
+            feed = read_changes(since)
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if feed['reset']:
+            return jsonify({'cursor': feed['cursor'], 'inserted': [], 'updated': [], 'deleted': [], 'reset': True}), 200
+        
+        is_admin = current_user['user_type'] == 'admin'
+        updated = {}
+        deleted = []
+        newly_visible = set()
+        for _, event in feed['events']:
+            trend_id = event['id']
+            if event['op'] == 'delete':
+                updated.pop(trend_id, None)
+                newly_visible.discard(trend_id)
+                # Non-admins never saw unconfirmed trends, so those deletes are invisible to them
+                if is_admin or event.get('previous_status') == 'confirmed':
+                    deleted.append(trend_id)
+            elif is_admin:
+                updated[trend_id] = {
+                    'id': trend_id,
+                    'status': event.get('status'),
+                    'reviewed_at': event.get('reviewed_at'),
+                    'reviewed_by': event.get('reviewed_by')
+                }
+            elif event.get('status') == 'confirmed' and event.get('previous_status') != 'confirmed':
+                # A trend that just got approved appears as an insert for non-admins
+                newly_visible.add(trend_id)
+        
+        # New rows since the cursor was issued; the margin absorbs clock skew, clients dedupe by id
+        since_created = iso_timestamp(feed['since'] - Config.CHANGE_FEED_CLOCK_SKEW_SECONDS)
+        query = apply_trend_filters(db.table('trends').select('*'), current_user, filters)
+        query = query.gt('created_at', since_created).order('created_at', desc=True)
+        inserted_rows = query.limit(Config.CHANGE_FEED_MAX_EVENTS + 1).execute().data
+        if len(inserted_rows) > Config.CHANGE_FEED_MAX_EVENTS:
+            # Too many new rows to patch in; the client refetches its view
+            return jsonify({'cursor': feed['cursor'], 'inserted': [], 'updated': [], 'deleted': [], 'reset': True}), 200
+        
+        known_ids = {row['id'] for row in inserted_rows}
+        newly_visible -= known_ids
+        if newly_visible:
+            query = apply_trend_filters(db.table('trends').select('*'), current_user, filters)
+            inserted_rows.extend(query.in_('id', list(newly_visible)).execute().data)
+        
+        deleted_ids = set(deleted)
+        inserted = [format_trend_for_user(row, current_user) for row in inserted_rows if row['id'] not in deleted_ids]
         
-        # Category filter - handle multiple values
-        categories = filters.getlist('category')
-        if categories:
-            if len(categories) == 1:
-                query = query.eq('category', categories[0])
-            else:
-                query = query.in_('category', categories)
+        return jsonify({
+            'cursor': feed['cursor'],
+            'inserted': inserted,
+            'updated': [change for trend_id, change in updated.items() if trend_id not in known_ids],
+            'deleted': deleted,
+            'reset': False
+        }), 200
         
-        # Subcategory filter - handle multiple values
-        sub_categories = filters.getlist('sub_category')
-        if sub_categories:
-            if len(sub_categories) == 1:
-                query = query.contains('sub_category', [sub_categories[0]])
-            else:
-                query = query.overlaps('sub_category', sub_categories)
+    except InvalidFilter as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return error_response(e)
+
+@bp.route('/facets', methods=['GET'])
+@token_required
+def get_trend_facets(current_user):
+    """Matching-trend counts for every value of every filter, each ignoring its own selection"""
+    try:
+        filters = taxonomy_index.normalise_filters(parse_trend_filters())
+        facets = fetch_facets(current_user, filters, visibility_scope(current_user))
+        return jsonify(facets), 200
         
-        # Impact Label filter - handle multiple values
-        impact_labels = filters.getlist('impact_label')
-        if impact_labels:
-            if len(impact_labels) == 1:
-                query = query.eq('impact_label', impact_labels[0])
-            else:
-                query = query.in_('impact_label', impact_labels)
-        
-        response = query.execute()
-        trends = response.data
-        
-        # Calculate statistics
-        stats = {
-            'total_trends': len(trends),
-            'by_category': {},
-            'by_department': {},
-            'by_impact': {
-                'high': 0,
-                'medium': 0,
-                'low': 0
-            },
-            'top_growing': [],
-            'highest_impact': []
-        }
+    except InvalidFilter as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return error_response(e)
+
+@bp.route('/stats', methods=['GET'])
+@token_required
+def get_trend_stats(current_user):
+    try:
+        filters = taxonomy_index.normalise_filters(parse_trend_filters(fields=STATS_FILTER_FIELDS))
         
-        # Process trends for statistics
-        for trend in trends:
-            # Count by category
-            category = trend.get('category', 'Unknown')
-            stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
-            
-            # Count by department
-            department = trend.get('department_name', 'Unknown')
-            stats['by_department'][department] = stats['by_department'].get(department, 0) + 1
-            
-            # Count by impact
-            impact_score = trend.get('impact_score', 0)
-            if impact_score >= 7:
-                stats['by_impact']['high'] += 1
-            elif impact_score >= 4:
-                stats['by_impact']['medium'] += 1
-            else:
-                stats['by_impact']['low'] += 1
-        
-        # Get highest impact trends (top 5)
-        sorted_by_impact = sorted(trends, key=lambda x: x.get('impact_score', 0), reverse=True)[:5]
-        stats['highest_impact'] = [
-            {
-                'id': t['id'],
-                'title': t['title'],
-                'impact_score': t.get('impact_score', 0),
-                'category': t.get('category')
-            }
-            for t in sorted_by_impact
-        ]
+        # Served from the precomputed stats cache when this filter set is popular
+        stats = stats_scheduler.get(
+            visibility_scope(current_user),
+            filter_key(filters),
+            lambda: fetch_trend_stats(current_user, filters)
+        )
         
         return jsonify({'stats': stats}), 200
         
+    except InvalidFilter as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
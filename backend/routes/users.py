@@ -1,6 +1,16 @@
 from flask import Blueprint, request, jsonify
 import bcrypt
+from config import Config
 from utils.auth_middleware import token_required, admin_required
+from utils.mutations import (
+    NotFound,
+    PreconditionFailed,
+    conditional_delete,
+    conditional_update,
+    etag_for,
+    if_match_token
+)
+from utils.resilience import error_response
 from database import db
 
 bp = Blueprint('users', __name__, url_prefix='/api/users')
@@ -15,7 +25,7 @@ def get_users(current_user):
         return jsonify({'users': response.data}), 200
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
 
 @bp.route('', methods=['POST'])
 @token_required
@@ -61,7 +71,7 @@ def create_user(current_user):
         return jsonify({'message': 'User created successfully', 'user': response.data[0]}), 201
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
 
 @bp.route('/<int:user_id>', methods=['PUT'])
 @token_required
@@ -70,11 +80,6 @@ def update_user(current_user, user_id):
     try:
         data = request.get_json()
         
-        # Check if user exists
-        existing = db.table('users').select('id').eq('id', user_id).execute()
-        if not existing.data or len(existing.data) == 0:
-            return jsonify({'error': 'User not found'}), 404
-        
         # Prepare update data
         update_data = {}
         
@@ -99,28 +104,42 @@ def update_user(current_user, user_id):
             hashed_password = bcrypt.hashpw(data['password'].encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
             update_data['password'] = hashed_password
         
-        # Update user
-        response = db.table('users').update(update_data).eq('id', user_id).execute()
+        if not update_data:
+            return jsonify({'error': 'No fields to update'}), 400
         
-        return jsonify({'message': 'User updated successfully', 'user': response.data[0]}), 200
+        # Update user in one round trip; an empty result means it does not exist
+        try:
+            user = conditional_update(
+                'users', {'id': user_id}, update_data, Config.USERS_VERSION_COLUMN, if_match_token()
+            )[0]
+        except NotFound:
+            return jsonify({'error': 'User not found'}), 404
         
+        response = jsonify({'message': 'User updated successfully', 'user': user})
+        etag = etag_for(user, Config.USERS_VERSION_COLUMN)
+        if etag:
+            response.headers['ETag'] = etag
+        return response, 200
+        
+    except PreconditionFailed as e:
+        return jsonify({'error': str(e)}), 412
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
 
 @bp.route('/<int:user_id>', methods=['DELETE'])
 @token_required
 @admin_required
 def delete_user(current_user, user_id):
     try:
-        # Check if user exists
-        existing = db.table('users').select('id').eq('id', user_id).execute()
-        if not existing.data or len(existing.data) == 0:
+        # Delete user in one round trip; an empty result means it does not exist
+        try:
+            conditional_delete('users', {'id': user_id}, Config.USERS_VERSION_COLUMN, if_match_token())
+        except NotFound:
             return jsonify({'error': 'User not found'}), 404
         
-        # Delete user
-        db.table('users').delete().eq('id', user_id).execute()
-        
         return jsonify({'message': 'User deleted successfully'}), 200
         
+    except PreconditionFailed as e:
+        return jsonify({'error': str(e)}), 412
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return error_response(e)
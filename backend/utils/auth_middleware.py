@@ -3,6 +3,8 @@ from flask import request, jsonify
 import jwt
 from config import Config
 from database import db
+from utils.resilience import UpstreamUnavailable, error_response
+from utils.profiler import run_profiled
 
 def token_required(f):
     @wraps(f)
@@ -38,9 +40,16 @@ def token_required(f):
             return jsonify({'error': 'Token has expired'}), 401
         except jwt.InvalidTokenError:
             return jsonify({'error': 'Invalid token'}), 401
+        except UpstreamUnavailable as e:
+            # Not the client's fault; a 401 here would log everyone out during an outage
+            return error_response(e)
         except Exception as e:
             return jsonify({'error': str(e)}), 401
         
+        # Opt-in admin profiling; a single flag check when disabled
+        if Config.PROFILING_ENABLED:
+            return run_profiled(current_user, f, *args, **kwargs)
+        
         return f(current_user, *args, **kwargs)
     
     return decorated
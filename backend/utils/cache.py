@@ -0,0 +1,519 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+from utils.structured_logging import get_logger
+
+logger = get_logger('cache')
+
+# Keys under this prefix (locks, review leases) are never evicted for size, only expired
+PINNED_PREFIX = 'pinned:'
+
+
+class MemoryStore:
+    """Process-local store, used when no shared backend is configured or available"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._events = {}
+        self._event_seq = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._set_locked(key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        # Check and insert under one lock so only one caller can win
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.time()):
+                return False
+            self._set_locked(key, value, ttl)
+            return True
+
+    def _set_locked(self, key, value, ttl):
+        # Caller holds the lock
+        self._entries[key] = (value, time.time() + ttl if ttl else None)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            now = time.time()
+            victim = next((
+                key for key, (_, expires_at) in self._entries.items()
+                if not key.startswith(PINNED_PREFIX) or (expires_at is not None and expires_at <= now)
+            ), None)
+            if victim is None:
+                break
+            del self._entries[victim]
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_version(self, namespace):
+        with self._lock:
+            return self._versions.get(namespace, 0)
+
+    def bump_version(self, namespace):
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+            return self._versions[namespace]
+
+    def append_events(self, stream, payloads, retention):
+        with self._lock:
+            events = self._events.setdefault(stream, [])
+            for payload in payloads:
+                self._event_seq += 1
+                events.append((self._event_seq, payload))
+            del events[:max(0, len(events) - retention)]
+            return self._event_seq
+
+    def read_events(self, stream, after_seq, limit):
+        with self._lock:
+            return [event for event in self._events.get(stream, []) if event[0] > after_seq][:limit]
+
+    def event_bounds(self, stream):
+        """(oldest retained seq, latest seq) of a stream; (0, 0) when empty"""
+        with self._lock:
+            events = self._events.get(stream)
+            if not events:
+                return 0, self._event_seq
+            return events[0][0], self._event_seq
+
+    def stats(self):
+        with self._lock:
+            return {'backend': self.name, 'entries': len(self._entries)}
+
+
+class SQLiteStore:
+    """Host-wide store in a WAL-mode SQLite file shared by every worker process.
+
+    Each thread (and each forked worker) opens its own connection. Values are
+    stored as JSON; once the total payload exceeds max_bytes, expired rows are
+    dropped first and then the oldest writes, except pinned keys.
+    """
+
+    name = 'sqlite'
+    EVICT_CHECK_EVERY = 100
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entries ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, '
+            'expires_at REAL, stored_at REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS cache_entries_stored_at ON cache_entries (stored_at)')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache_versions ('
+            'namespace TEXT PRIMARY KEY, version INTEGER NOT NULL)'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS event_log ('
+            'seq INTEGER PRIMARY KEY AUTOINCREMENT, stream TEXT NOT NULL, payload TEXT NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS event_log_stream_seq ON event_log (stream, seq)')
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT value, expires_at FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None and row[1] <= time.time():
+            return None
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        payload = json.dumps(value, default=str)
+        now = time.time()
+        self._connection().execute(
+            'INSERT INTO cache_entries (key, value, size, expires_at, stored_at) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size, '
+            'expires_at = excluded.expires_at, stored_at = excluded.stored_at',
+            (key, payload, len(payload), now + ttl if ttl else None, now)
+        )
+        self._maybe_evict()
+
+    def add(self, key, value, ttl=None):
+        """Set the key only if it is absent or expired; returns whether it was set"""
+        payload = json.dumps(value, default=str)
+        now = time.time()
+        cursor = self._connection().execute(
+            'INSERT INTO cache_entries (key, value, size, expires_at, stored_at) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size, '
+            'expires_at = excluded.expires_at, stored_at = excluded.stored_at '
+            'WHERE cache_entries.expires_at IS NOT NULL AND cache_entries.expires_at <= ?',
+            (key, payload, len(payload), now + ttl if ttl else None, now, now)
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key):
+        self._connection().execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+
+    def get_version(self, namespace):
+        row = self._connection().execute(
+            'SELECT version FROM cache_versions WHERE namespace = ?', (namespace,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump_version(self, namespace):
+        conn = self._connection()
+        conn.execute(
+            'INSERT INTO cache_versions (namespace, version) VALUES (?, 1) '
+            'ON CONFLICT(namespace) DO UPDATE SET version = version + 1',
+            (namespace,)
+        )
+        return self.get_version(namespace)
+
+    def append_events(self, stream, payloads, retention):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT INTO event_log (stream, payload) VALUES (?, ?)',
+                [(stream, json.dumps(payload, default=str)) for payload in payloads]
+            )
+            last_seq = conn.execute('SELECT MAX(seq) FROM event_log').fetchone()[0] or 0
+            conn.execute(
+                'DELETE FROM event_log WHERE stream = ? AND seq <= '
+                '(SELECT seq FROM event_log WHERE stream = ? ORDER BY seq DESC LIMIT 1 OFFSET ?)',
+                (stream, stream, retention)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return last_seq
+
+    def read_events(self, stream, after_seq, limit):
+        rows = self._connection().execute(
+            'SELECT seq, payload FROM event_log WHERE stream = ? AND seq > ? ORDER BY seq LIMIT ?',
+            (stream, after_seq, limit)
+        ).fetchall()
+        return [(seq, json.loads(payload)) for seq, payload in rows]
+
+    def event_bounds(self, stream):
+        conn = self._connection()
+        oldest = conn.execute('SELECT MIN(seq) FROM event_log WHERE stream = ?', (stream,)).fetchone()[0]
+        latest = conn.execute('SELECT MAX(seq) FROM event_log').fetchone()[0]
+        return oldest or 0, latest or 0
+
+    def stats(self):
+        row = self._connection().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries').fetchone()
+        return {'backend': self.name, 'path': self.path, 'entries': row[0], 'bytes': row[1], 'max_bytes': self.max_bytes}
+
+    def _maybe_evict(self):
+        with self._writes_lock:
+            self._writes += 1
+            if self._writes % self.EVICT_CHECK_EVERY != 0:
+                return
+
+        conn = self._connection()
+        conn.execute('DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?', (time.time(),))
+        evictable = "key NOT LIKE '" + PINNED_PREFIX + "%'"
+        total = conn.execute(f'SELECT COALESCE(SUM(size), 0) FROM cache_entries WHERE {evictable}').fetchone()[0]
+        while total > self.max_bytes:
+            # Drop the oldest tenth of the evictable entries until back under the bound
+            count = conn.execute(f'SELECT COUNT(*) FROM cache_entries WHERE {evictable}').fetchone()[0]
+            if not count:
+                break
+            conn.execute(
+                'DELETE FROM cache_entries WHERE key IN '
+                f'(SELECT key FROM cache_entries WHERE {evictable} ORDER BY stored_at LIMIT ?)',
+                (max(1, count // 10),)
+            )
+            total = conn.execute(f'SELECT COALESCE(SUM(size), 0) FROM cache_entries WHERE {evictable}').fetchone()[0]
+
+
+class RedisStore:
+    """Shared store on a Redis-compatible server; size is bounded by its maxmemory policy.
+
+    Pinned keys carry a TTL, so a volatile-* eviction policy could drop them;
+    run the server with noeviction or an allkeys-* policy sized for the cache.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url, prefix='trends:'):
+        import redis  # optional dependency, only needed for CACHE_BACKEND=redis
+
+        self.url = url
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        raw = self._client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl=None):
+        self._client.set(self.prefix + key, json.dumps(value, default=str), px=int(ttl * 1000) if ttl else None)
+
+    def add(self, key, value, ttl=None):
+        return bool(self._client.set(
+            self.prefix + key, json.dumps(value, default=str), nx=True, px=int(ttl * 1000) if ttl else None
+        ))
+
+    def delete(self, key):
+        self._client.delete(self.prefix + key)
+
+    def get_version(self, namespace):
+        return int(self._client.get(f'{self.prefix}version:{namespace}') or 0)
+
+    def bump_version(self, namespace):
+        return int(self._client.incr(f'{self.prefix}version:{namespace}'))
+
+    def append_events(self, stream, payloads, retention):
+        key = f'{self.prefix}events:{stream}'
+        last_seq = 0
+        for payload in payloads:
+            last_seq = int(self._client.incr(f'{self.prefix}events_seq'))
+            self._client.zadd(key, {json.dumps({'seq': last_seq, 'payload': payload}, default=str): last_seq})
+        self._client.zremrangebyrank(key, 0, -retention - 1)
+        return last_seq
+
+    def read_events(self, stream, after_seq, limit):
+        raw = self._client.zrangebyscore(f'{self.prefix}events:{stream}', f'({after_seq}', '+inf', start=0, num=limit)
+        events = [json.loads(item) for item in raw]
+        return [(event['seq'], event['payload']) for event in events]
+
+    def event_bounds(self, stream):
+        oldest = self._client.zrange(f'{self.prefix}events:{stream}', 0, 0, withscores=True)
+        latest = int(self._client.get(f'{self.prefix}events_seq') or 0)
+        return (int(oldest[0][1]) if oldest else 0), latest
+
+    def stats(self):
+        return {'backend': self.name}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_shared_store():
+    """The host-wide store selected by CACHE_BACKEND, falling back to memory"""
+    global _store
+
+    if _store is not None:
+        return _store
+
+    with _store_lock:
+        if _store is None:
+            backend = Config.CACHE_BACKEND
+            try:
+                if backend == 'redis':
+                    _store = RedisStore(Config.CACHE_REDIS_URL)
+                elif backend == 'sqlite':
+                    path = Config.CACHE_SQLITE_PATH or os.path.join(tempfile.gettempdir(), 'trends-dashboard-cache.sqlite3')
+                    _store = SQLiteStore(path, Config.CACHE_MAX_BYTES)
+            except Exception as e:
+                logger.warning('cache.backend_unavailable', backend=backend, error=str(e))
+            if _store is None:
+                _store = MemoryStore()
+    return _store
+
+
+_caches = []
+
+
+class TieredCache:
+    """Namespace of cached values with a small local tier in front of the shared store.
+
+    Shared keys embed the namespace version, so invalidate() bumps the version
+    once and every worker stops seeing the old values. Local entries live for
+    at most local_ttl so workers pick up values written by their peers.
+    """
+
+    def __init__(self, namespace, local_max_entries=256, local_ttl=5, shared_ttl=None):
+        self.namespace = namespace
+        self.local_max_entries = local_max_entries
+        self.local_ttl = local_ttl
+        self.shared_ttl = shared_ttl
+
+        self._lock = threading.Lock()
+        self._local = OrderedDict()
+        self._version = None
+        self._version_checked_at = 0.0
+        self._metrics = {
+            'local_hits': 0,
+            'shared_hits': 0,
+            'misses': 0,
+            'sets': 0,
+            'invalidations': 0,
+            'errors': 0
+        }
+        _caches.append(self)
+
+    @property
+    def store(self):
+        return get_shared_store()
+
+    def version(self):
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked_at >= Config.CACHE_VERSION_CHECK_SECONDS:
+            try:
+                version = self.store.get_version(self.namespace)
+            except Exception:
+                self._count('errors')
+                version = self._version or 0
+            with self._lock:
+                if version != self._version:
+                    self._local.clear()
+                self._version = version
+                self._version_checked_at = now
+        return self._version
+
+    def get(self, key):
+        version = self.version()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                value, entry_version, expires_at = entry
+                if entry_version == version and expires_at > now:
+                    self._local.move_to_end(key)
+                    self._metrics['local_hits'] += 1
+                    return value
+                del self._local[key]
+
+        try:
+            value = self.store.get(self._shared_key(key, version))
+        except Exception:
+            self._count('errors')
+            value = None
+
+        if value is None:
+            self._count('misses')
+            return None
+
+        self._count('shared_hits')
+        self._set_local(key, value, version)
+        return value
+
+    def set(self, key, value, version=None, ttl=None):
+        """Store a value; pass the version read before computing it to avoid racing invalidate()"""
+        current_version = self.version()
+        if version is None:
+            version = current_version
+        if version != current_version:
+            # Invalidated while the value was being computed
+            return
+
+        try:
+            self.store.set(self._shared_key(key, version), value, ttl or self.shared_ttl)
+        except Exception:
+            self._count('errors')
+        self._set_local(key, value, version)
+        self._count('sets')
+
+    def get_previous(self, key):
+        """Value stored under the version before the current one, read from the shared tier only"""
+        version = self.version()
+        if not version:
+            return None
+        try:
+            return self.store.get(self._shared_key(key, version - 1))
+        except Exception:
+            self._count('errors')
+            return None
+
+    def discard_local(self, key):
+        with self._lock:
+            self._local.pop(key, None)
+
+    def acquire(self, name, ttl):
+        """Host-wide best-effort lock; returns False if another holder has it"""
+        try:
+            return self.store.add(f'{PINNED_PREFIX}{self.namespace}:lock:{name}', os.getpid(), ttl)
+        except Exception:
+            self._count('errors')
+            return True
+
+    def release(self, name):
+        try:
+            self.store.delete(f'{PINNED_PREFIX}{self.namespace}:lock:{name}')
+        except Exception:
+            self._count('errors')
+
+    def invalidate(self):
+        try:
+            version = self.store.bump_version(self.namespace)
+        except Exception:
+            self._count('errors')
+            version = (self._version or 0) + 1
+        with self._lock:
+            self._local.clear()
+            self._version = version
+            self._version_checked_at = time.monotonic()
+            self._metrics['invalidations'] += 1
+
+    def metrics(self):
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['local_entries'] = len(self._local)
+            metrics['version'] = self._version
+        lookups = metrics['local_hits'] + metrics['shared_hits'] + metrics['misses']
+        metrics['hit_ratio'] = (metrics['local_hits'] + metrics['shared_hits']) / lookups if lookups else 0.0
+        return metrics
+
+    def _shared_key(self, key, version):
+        return f'{self.namespace}:v{version}:{key}'
+
+    def _set_local(self, key, value, version):
+        with self._lock:
+            self._local[key] = (value, version, time.monotonic() + self.local_ttl)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def _count(self, name):
+        with self._lock:
+            self._metrics[name] += 1
+
+
+def cache_metrics():
+    try:
+        backend = get_shared_store().stats()
+    except Exception as e:
+        backend = {'error': str(e)}
+    return {
+        'backend': backend,
+        'namespaces': {cache.namespace: cache.metrics() for cache in _caches}
+    }
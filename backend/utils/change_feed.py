@@ -0,0 +1,93 @@
+import time
+from datetime import datetime, timezone
+from config import Config
+from utils.cache import get_shared_store
+from utils.structured_logging import get_logger
+
+logger = get_logger('change_feed')
+
+STREAM = 'trends'
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def make_cursor(seq, issued_at=None):
+    """Cursor = last seen event sequence + the time it was issued (for insert detection)"""
+    issued_at = time.time() if issued_at is None else issued_at
+    return f'{seq}-{int(issued_at * 1000)}'
+
+
+def parse_cursor(cursor):
+    try:
+        seq, issued_ms = cursor.split('-')
+        return int(seq), int(issued_ms) / 1000
+    except (AttributeError, ValueError):
+        raise InvalidCursor(f'Invalid cursor: {cursor}')
+
+
+def trend_change_event(op, before, after=None):
+    """Event recorded for an update or delete of one trend"""
+    current = after if after is not None else before
+    return {
+        'op': op,
+        'id': current['id'],
+        'status': current.get('status'),
+        'previous_status': before.get('status'),
+        'reviewed_at': current.get('reviewed_at'),
+        'reviewed_by': current.get('reviewed_by')
+    }
+
+
+def current_cursor():
+    _, latest = get_shared_store().event_bounds(STREAM)
+    return make_cursor(latest)
+
+
+def record_changes(events):
+    """Append change events and return the cursor just past them.
+
+    Failing to record must not fail the mutation that already happened, so
+    errors are logged and None is returned; clients treat a missing cursor
+    as a signal to refetch.
+    """
+    try:
+        if not events:
+            return current_cursor()
+        last_seq = get_shared_store().append_events(STREAM, events, Config.CHANGE_FEED_RETENTION)
+        return make_cursor(last_seq)
+    except Exception as e:
+        logger.warning('change_feed.record_failed', events=len(events), error=str(e))
+        return None
+
+
+def read_changes(cursor):
+    """Events after the cursor as {'events', 'since', 'cursor', 'reset'}.
+
+    reset is set when the log no longer holds everything after the cursor
+    (trimmed, more than CHANGE_FEED_MAX_EVENTS behind, or issued longer than
+    CHANGE_FEED_MAX_CURSOR_AGE_SECONDS ago); the client must then refetch its
+    view. Cursors issued in the future are invalid.
+    """
+    seq, since = parse_cursor(cursor)
+    issued_at = time.time()
+    if since > issued_at + Config.CHANGE_FEED_CLOCK_SKEW_SECONDS:
+        raise InvalidCursor(f'Cursor is from the future: {cursor}')
+    store = get_shared_store()
+
+    oldest, latest = store.event_bounds(STREAM)
+    too_old = issued_at - since > Config.CHANGE_FEED_MAX_CURSOR_AGE_SECONDS
+    if too_old or seq > latest or (oldest and seq < oldest - 1):
+        return {'events': [], 'since': since, 'cursor': make_cursor(latest, issued_at), 'reset': True}
+
+    events = store.read_events(STREAM, seq, Config.CHANGE_FEED_MAX_EVENTS + 1)
+    if len(events) > Config.CHANGE_FEED_MAX_EVENTS:
+        return {'events': [], 'since': since, 'cursor': make_cursor(latest, issued_at), 'reset': True}
+
+    last_seq = events[-1][0] if events else seq
+    return {'events': events, 'since': since, 'cursor': make_cursor(last_seq, issued_at), 'reset': False}
+
+
+def iso_timestamp(epoch_seconds):
+    return datetime.fromtimestamp(epoch_seconds, tz=timezone.utc).isoformat()
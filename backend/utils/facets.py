@@ -0,0 +1,106 @@
+from collections import Counter
+from config import Config
+from utils.cache import TieredCache
+from utils.trend_queries import ARRAY_FILTER_FIELDS, TREND_FILTER_FIELDS, scan_trends
+
+# Columns the facet pass reads: the id plus every filter dimension
+FACET_COLUMNS = 'id, ' + ', '.join(TREND_FILTER_FIELDS)
+
+# Entries are small count tables, and mutations bump the version, so workers keep
+# their local copy for the whole TTL instead of re-reading it every few seconds
+facets_cache = TieredCache(
+    'facets',
+    local_max_entries=2,
+    local_ttl=Config.FACETS_CACHE_TTL_SECONDS,
+    shared_ttl=Config.FACETS_CACHE_TTL_SECONDS
+)
+
+
+def facet_fields(current_user):
+    """Dimensions to count; only admins can filter on review status"""
+    if current_user['user_type'] == 'admin':
+        return list(TREND_FILTER_FIELDS)
+    return [field for field in TREND_FILTER_FIELDS if field != 'status']
+
+
+def _failed_fields(row, filters):
+    failed = []
+    for field, values in filters.items():
+        if field in ARRAY_FILTER_FIELDS:
+            if not set(row.get(field) or []) & set(values):
+                failed.append(field)
+        elif row.get(field) not in values:
+            failed.append(field)
+    return failed
+
+
+def summarise(rows):
+    """Collapse projected rows into [value per filter dimension..., count] combinations.
+
+    Trends share a small number of department/category/subcategory/status
+    combinations, so this is far smaller than the rows it replaces and it is
+    what gets cached. Array values are stored as sorted lists.
+    """
+    combinations = Counter()
+    for row in rows:
+        values = []
+        for field in TREND_FILTER_FIELDS:
+            value = row.get(field)
+            if field in ARRAY_FILTER_FIELDS:
+                value = tuple(sorted(set(value or []), key=str))
+            values.append(value)
+        combinations[tuple(values)] += 1
+    return [[list(value) if isinstance(value, tuple) else value for value in values] + [count]
+            for values, count in combinations.items()]
+
+
+def compute_facets(combinations, filters, fields):
+    """Count every value of every dimension in one pass over the combinations.
+
+    Each dimension is counted ignoring its own selection: a combination that
+    passes all selections counts in every dimension, one that fails exactly
+    one counts only in that dimension, anything else counts nowhere. Selected
+    values with no matches are reported with a count of 0.
+    """
+    facets = {field: {value: 0 for value in filters.get(field, [])} for field in fields}
+    total = 0
+
+    for combination in combinations:
+        row = dict(zip(TREND_FILTER_FIELDS, combination))
+        weight = combination[-1]
+        failed = _failed_fields(row, filters)
+        if not failed:
+            total += weight
+            counted = fields
+        elif len(failed) == 1 and failed[0] in facets:
+            counted = failed
+        else:
+            continue
+
+        for field in counted:
+            values = row.get(field)
+            if values is None:
+                continue
+            if field not in ARRAY_FILTER_FIELDS:
+                values = [values]
+            counts = facets[field]
+            for value in values:
+                counts[value] = counts.get(value, 0) + weight
+
+    return {'total': total, 'facets': facets}
+
+
+def fetch_facets(current_user, filters, scope):
+    """Facet counts for a filter set over the scope's cached combination counts.
+
+    The combinations depend only on the visibility scope, so one paged scan
+    per scope serves every filter combination until the cache expires or a
+    mutation invalidates it; the counting pass runs per request.
+    """
+    combinations = facets_cache.get(scope)
+    if combinations is None:
+        version = facets_cache.version()
+        # Only the completeness and role filters go to Supabase; selections are applied per combination
+        combinations = summarise(scan_trends(FACET_COLUMNS, current_user, {}))
+        facets_cache.set(scope, combinations, version=version)
+    return compute_facets(combinations, filters, facet_fields(current_user))
@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+from flask import request
+from database import db
+from utils.structured_logging import get_logger
+
+logger = get_logger('mutations')
+
+# PostgreSQL undefined_column, and PostgREST's "column not in schema cache"
+MISSING_COLUMN_CODES = {'42703', 'PGRST204'}
+
+# (table, column) pairs found not to exist; writes to them skip versioning
+_missing_version_columns = set()
+
+
+class NotFound(Exception):
+    pass
+
+
+class PreconditionFailed(Exception):
+    pass
+
+
+def if_match_token():
+    """Version token from the If-Match header, or None when absent or '*'"""
+    value = request.headers.get('If-Match')
+    if not value:
+        return None
+    value = value.strip()
+    if value.startswith('W/'):
+        value = value[2:]
+    value = value.strip('"')
+    return None if value in ('', '*') else value
+
+
+def etag_for(row, version_column):
+    value = row.get(version_column) if row else None
+    return f'"{value}"' if value is not None else None
+
+
+def _apply_conditions(query, match, version_column, if_match):
+    for column, value in match.items():
+        query = query.eq(column, value)
+    if if_match is not None:
+        query = query.eq(version_column, if_match)
+    return query
+
+
+def _raise_for_empty(table, match, if_match):
+    # Only reached when nothing matched: tell a missing row from a stale precondition
+    if if_match is not None:
+        existing = _apply_conditions(db.table(table).select('id'), match, None, None).execute()
+        if existing.data:
+            raise PreconditionFailed('The resource was modified by someone else; reload and try again')
+    raise NotFound()
+
+
+def _version_value():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _is_missing_column(e, column):
+    message = f"{e} {getattr(e, 'message', '')}"
+    return str(getattr(e, 'code', '')) in MISSING_COLUMN_CODES and column in message
+
+
+def _versioned(table, version_column, write):
+    """Run write(version_column) and fall back to an unversioned write if the column is missing.
+
+    Without the column there is nothing to compare If-Match against, so the
+    precondition is dropped; rows then carry no version and no ETag is sent,
+    so well-behaved clients stop sending If-Match.
+    """
+    if version_column and (table, version_column) not in _missing_version_columns:
+        try:
+            return write(version_column)
+        except Exception as e:
+            if not _is_missing_column(e, version_column):
+                raise
+            _missing_version_columns.add((table, version_column))
+            logger.warning('mutations.version_column_missing', table=table, column=version_column)
+    return write(None)
+
+
+def conditional_update(table, match, values, version_column=None, if_match=None, probe=True):
+    """Update matching rows in one round trip and return them.
+
+    match holds equality conditions (the primary key plus any state guard).
+    The version column is set to a fresh timestamp in the same statement, so
+    every write changes the ETag. The write returns its representation, so
+    an empty result means nothing matched: NotFound, or PreconditionFailed
+    when an If-Match token was given for a row that still exists. Callers
+    that read the row themselves after a miss pass probe=False to skip the
+    existence check and always get NotFound.
+    """
+    def write(column):
+        update = dict(values, **{column: _version_value()}) if column else values
+        token = if_match if column else None
+        response = _apply_conditions(db.table(table).update(update), match, column, token).execute()
+        if not response.data:
+            if not probe:
+                raise NotFound()
+            _raise_for_empty(table, match, token)
+        return response.data
+
+    return _versioned(table, version_column, write)
+
+
+def conditional_delete(table, match, version_column=None, if_match=None):
+    """Delete matching rows in one round trip and return the deleted rows"""
+    if if_match is None:
+        version_column = None
+
+    def write(column):
+        token = if_match if column else None
+        response = _apply_conditions(db.table(table).delete(), match, column, token).execute()
+        if not response.data:
+            _raise_for_empty(table, match, token)
+        return response.data
+
+    return _versioned(table, version_column, write)
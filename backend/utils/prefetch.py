@@ -0,0 +1,194 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from utils.cache import TieredCache
+from utils.structured_logging import get_logger
+from utils.trend_queries import fetch_trend_page
+
+logger = get_logger('prefetch')
+
+
+class TokenBucket:
+    """Per-user allowance of capacity tokens, refilled at rate tokens per second"""
+
+    def __init__(self, capacity, rate):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def take(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class PagePrefetcher:
+    """Fetches page N+1 of the trends list in the background after page N is served.
+
+    Pages are keyed by (visibility scope, canonical filter key, page, limit)
+    and kept as raw rows in the shared 'trend_pages' cache for a few seconds,
+    so whichever worker serves the next click can answer from memory. Each
+    user has a token-bucket prefetch budget, and a prefetch still pending
+    when the same user switches filters or page size is cancelled (or its
+    result discarded if it already started).
+    """
+
+    def __init__(self, ttl, workers, budget, budget_per_minute, max_tracked_users):
+        self.budget = budget
+        self.budget_rate = budget_per_minute / 60
+        self.max_tracked_users = max_tracked_users
+        self._cache = TieredCache(
+            'trend_pages',
+            local_max_entries=512,
+            local_ttl=min(Config.CACHE_LOCAL_TTL_SECONDS, ttl),
+            shared_ttl=ttl
+        )
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch')
+        self._lock = threading.Lock()
+        # Least recently active users are forgotten first; a new bucket starts full
+        self._buckets = OrderedDict()
+        self._pending = {}
+        self._metrics = {
+            'lookups': 0,
+            'hits': 0,
+            'scheduled': 0,
+            'completed': 0,
+            'cancelled': 0,
+            'discarded': 0,
+            'over_budget': 0,
+            'errors': 0
+        }
+
+    def get(self, user_id, scope, key, page, limit):
+        """Prefetched page or None; cancels the user's prefetch for any other filter set"""
+        context = (scope, key, limit)
+        stale = None
+        with self._lock:
+            self._metrics['lookups'] += 1
+            pending = self._pending.get(user_id)
+            if pending is not None and pending[0] != context:
+                stale = self._pending.pop(user_id)[1]
+
+        # Outside the lock: cancel() runs the done callback, which takes it
+        if stale is not None and stale.cancel():
+            self._count('cancelled')
+
+        page_data = self._cache.get(self._cache_id(scope, key, page, limit))
+        if page_data is not None:
+            self._count('hits')
+        return page_data
+
+    def schedule(self, current_user, filters, scope, key, page, limit):
+        """Queue a fetch of the given page unless it is cached, pending or over budget"""
+        user_id = current_user['id']
+        context = (scope, key, limit)
+        cache_id = self._cache_id(scope, key, page, limit)
+        if self._cache.get(cache_id) is not None:
+            return
+
+        with self._lock:
+            pending = self._pending.get(user_id)
+            if pending is not None and pending[0] == context and pending[2] == page and not pending[1].done():
+                return
+            bucket = self._bucket(user_id)
+            if not bucket.take():
+                self._metrics['over_budget'] += 1
+                return
+            # Only role and filters matter to the query, not who asked for it
+            user = {'id': user_id, 'user_type': current_user['user_type']}
+            version = self._cache.version()
+            future = self._executor.submit(self._fetch, user, filters, context, page, cache_id, version)
+            self._pending[user_id] = (context, future, page)
+            self._metrics['scheduled'] += 1
+
+        # Outside the lock: the callback runs immediately if the fetch already finished
+        future.add_done_callback(lambda done: self._forget(user_id, done))
+
+    def invalidate(self):
+        self._cache.invalidate()
+
+    def metrics(self):
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['pending'] = sum(1 for pending in self._pending.values() if not pending[1].done())
+            metrics['tracked_users'] = len(self._buckets)
+        metrics['hit_ratio'] = metrics['hits'] / metrics['lookups'] if metrics['lookups'] else 0.0
+        metrics['useful_ratio'] = metrics['hits'] / metrics['completed'] if metrics['completed'] else 0.0
+        return metrics
+
+    def _fetch(self, user, filters, context, page, cache_id, version):
+        try:
+            page_data = fetch_trend_page(user, filters, page, context[2])
+        except Exception as e:
+            self._count('errors')
+            logger.warning('prefetch.failed', page=page, error=str(e))
+            return
+
+        with self._lock:
+            pending = self._pending.get(user['id'])
+            current = pending is not None and pending[0] == context and pending[2] == page
+        if not current:
+            # The user moved on to other filters while this was running
+            self._count('discarded')
+            return
+        self._cache.set(cache_id, page_data, version=version)
+        self._count('completed')
+
+    def _bucket(self, user_id):
+        # Caller holds the lock
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            bucket = self._buckets[user_id] = TokenBucket(self.budget, self.budget_rate)
+            while len(self._buckets) > self.max_tracked_users:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(user_id)
+        return bucket
+
+    def _forget(self, user_id, future):
+        with self._lock:
+            pending = self._pending.get(user_id)
+            if pending is not None and pending[1] is future:
+                del self._pending[user_id]
+
+    def _cache_id(self, scope, key, page, limit):
+        return f'{scope}:{key}:{page}:{limit}'
+
+    def _count(self, name):
+        with self._lock:
+            self._metrics[name] += 1
+
+
+page_prefetcher = PagePrefetcher(
+    ttl=Config.PREFETCH_TTL_SECONDS,
+    workers=Config.PREFETCH_WORKERS,
+    budget=Config.PREFETCH_BUDGET,
+    budget_per_minute=Config.PREFETCH_BUDGET_PER_MINUTE,
+    max_tracked_users=Config.PREFETCH_MAX_TRACKED_USERS
+)
+
+
+def fetch_page(current_user, filters, scope, key, page, limit):
+    """One trends page, served from a prefetch when there is one.
+
+    With PREFETCH_ENABLED the page may already be in the prefetch cache, and
+    once it is served the next page is queued in the background. Otherwise
+    this is just fetch_trend_page.
+    """
+    if not Config.PREFETCH_ENABLED:
+        return fetch_trend_page(current_user, filters, page, limit)
+
+    # The previous page may already have prefetched this one
+    page_data = page_prefetcher.get(current_user['id'], scope, key, page, limit)
+    if page_data is None:
+        page_data = fetch_trend_page(current_user, filters, page, limit)
+    if page * limit < page_data['total']:
+        page_prefetcher.schedule(current_user, filters, scope, key, page + 1, limit)
+    return page_data
@@ -0,0 +1,102 @@
+import cProfile
+import os
+import pstats
+import tempfile
+import threading
+import time
+import uuid
+from flask import current_app, g, jsonify, request
+from config import Config
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only one cProfile can be active per process (sys.monitoring on 3.12+)
+_profile_lock = threading.Lock()
+
+
+def profile_requested():
+    return request.args.get('__profile') == '1' or request.headers.get('X-Profile') == '1'
+
+
+def record_upstream_call(table, seconds, outcome):
+    """Called by the resilience layer; only collects while a profiled request runs"""
+    calls = g.get('upstream_calls')
+    if calls is not None:
+        calls.append({'table': table, 'seconds': round(seconds, 6), 'outcome': outcome})
+
+
+def _call_site(key):
+    filename, line, function = key
+    if filename.startswith(BACKEND_DIR):
+        filename = os.path.relpath(filename, BACKEND_DIR)
+    return f'{function} ({filename}:{line})' if line else function
+
+
+def _top_call_sites(stats, limit):
+    rows = []
+    for key, (primitive_calls, calls, total_time, cumulative_time, _) in stats.stats.items():
+        rows.append({
+            'call_site': _call_site(key),
+            'calls': calls,
+            'primitive_calls': primitive_calls,
+            'total_time': round(total_time, 6),
+            'cumulative_time': round(cumulative_time, 6)
+        })
+    rows.sort(key=lambda row: row['cumulative_time'], reverse=True)
+    return rows[:limit]
+
+
+def _save(profiler):
+    directory = Config.PROFILE_DIR or os.path.join(tempfile.gettempdir(), 'trends-profiles')
+    os.makedirs(directory, exist_ok=True)
+    # The request id comes from a client header, so it never goes into the path
+    name = f"{request.endpoint or 'request'}-{uuid.uuid4().hex}.prof"
+    path = os.path.join(directory, name)
+    # pstats dump; flamegraphs via e.g. flameprof or snakeviz
+    profiler.dump_stats(path)
+    return path
+
+
+def run_profiled(current_user, f, *args, **kwargs):
+    """Run the view under cProfile for admins who asked for it, else call it as usual.
+
+    The profiled response wraps the original body:
+    {'profile': {...}, 'status': <original status>, 'response': <original JSON>}
+    If another request in this process is already being profiled, the view
+    runs unprofiled and the response carries X-Profile-Skipped: busy.
+    """
+    if current_user['user_type'] != 'admin' or not profile_requested():
+        return f(current_user, *args, **kwargs)
+
+    if not _profile_lock.acquire(blocking=False):
+        response = current_app.make_response(f(current_user, *args, **kwargs))
+        response.headers['X-Profile-Skipped'] = 'busy'
+        return response
+
+    try:
+        g.upstream_calls = []
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        result = profiler.runcall(f, current_user, *args, **kwargs)
+        wall_seconds = time.perf_counter() - started
+    finally:
+        _profile_lock.release()
+
+    response = current_app.make_response(result)
+    stats = pstats.Stats(profiler)
+    upstream_seconds = sum(call['seconds'] for call in g.upstream_calls)
+
+    profile = {
+        'endpoint': request.endpoint,
+        'wall_seconds': round(wall_seconds, 6),
+        'upstream_seconds': round(upstream_seconds, 6),
+        'upstream_calls': g.upstream_calls,
+        'top_call_sites': _top_call_sites(stats, Config.PROFILE_TOP_N),
+        'saved_to': _save(profiler) if request.args.get('__profile_save') == '1' else None
+    }
+
+    return jsonify({
+        'profile': profile,
+        'status': response.status_code,
+        'response': response.get_json(silent=True)
+    }), response.status_code
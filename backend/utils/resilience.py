@@ -0,0 +1,268 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import g, has_request_context, jsonify
+from config import Config
+from utils.profiler import record_upstream_call
+from utils.structured_logging import get_logger
+
+try:
+    import httpx
+    TRANSIENT_ERRORS = (httpx.TransportError,)
+except ImportError:  # pragma: no cover - httpx ships with supabase
+    TRANSIENT_ERRORS = ()
+
+try:
+    from postgrest.exceptions import APIError
+except ImportError:  # pragma: no cover - postgrest ships with supabase
+    APIError = None
+
+# APIError codes that mean Supabase itself is failing: statement timeout,
+# connection loss/exhaustion, shutdowns and PostgREST's own "no database" errors.
+# HTTP 5xx statuses (reported as the code when the body is not JSON) count too.
+TRANSIENT_API_CODES = {'57014', '53300', '57P01', '57P02', '57P03', 'PGRST000', 'PGRST001', 'PGRST002'}
+
+logger = get_logger('resilience')
+
+# Builder methods that start a write; everything else chained after select() is a read
+WRITE_METHODS = {'insert', 'update', 'upsert', 'delete'}
+
+
+class UpstreamUnavailable(Exception):
+    """Supabase could not be reached in time; the request should fail fast with 503"""
+    status_code = 503
+
+
+class DeadlineExceeded(UpstreamUnavailable):
+    status_code = 504
+
+
+class CircuitOpenError(UpstreamUnavailable):
+    pass
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive transient failures -> half-open probe after a cool-down"""
+
+    def __init__(self, name, failure_threshold, reset_timeout):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._metrics = {'rejected': 0, 'opened': 0}
+
+    def allow(self):
+        with self._lock:
+            if self._state == 'closed':
+                return True
+            if self._state == 'open' and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = 'half_open'
+            if self._state == 'half_open' and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._metrics['rejected'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = 'closed'
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """The call ended without telling us anything about upstream health"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == 'half_open' or self._failures >= self.failure_threshold:
+                if self._state != 'open':
+                    self._metrics['opened'] += 1
+                    logger.warning('upstream.circuit_opened', table=self.name, failures=self._failures)
+                self._state = 'open'
+                self._opened_at = time.monotonic()
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._metrics, state=self._state, failures=self._failures)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=Config.UPSTREAM_MAX_CONCURRENCY, thread_name_prefix='upstream')
+_metrics_lock = threading.Lock()
+_metrics = {'calls': 0, 'retries': 0, 'timeouts': 0, 'failures': 0, 'rejected': 0}
+
+
+def get_breaker(table):
+    breaker = _breakers.get(table)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(table, CircuitBreaker(
+                table, Config.CIRCUIT_FAILURE_THRESHOLD, Config.CIRCUIT_RESET_SECONDS
+            ))
+    return breaker
+
+
+def _count(name):
+    with _metrics_lock:
+        _metrics[name] += 1
+
+
+def remaining_budget():
+    """Seconds left in the current request's upstream budget (or a fresh budget off-request)"""
+    if has_request_context() and g.get('deadline') is not None:
+        return g.deadline - time.monotonic()
+    return Config.REQUEST_BUDGET_SECONDS
+
+
+def _is_transient_api_error(exc):
+    if APIError is None or not isinstance(exc, APIError):
+        return False
+    code = str(getattr(exc, 'code', '') or '')
+    return (
+        code in TRANSIENT_API_CODES
+        or code.startswith('08')
+        or (len(code) == 3 and code.startswith('5') and code.isdigit())
+    )
+
+
+def _is_transient(exc):
+    return isinstance(exc, DeadlineExceeded) or isinstance(exc, TRANSIENT_ERRORS) or _is_transient_api_error(exc)
+
+
+def _call_with_deadline(execute, table):
+    timeout = min(Config.UPSTREAM_CALL_TIMEOUT_SECONDS, remaining_budget())
+    if timeout <= 0:
+        raise DeadlineExceeded(f'Request budget exhausted before querying {table}')
+
+    profiling = Config.PROFILING_ENABLED and has_request_context()
+    started = time.perf_counter() if profiling else 0.0
+    outcome = 'ok'
+    future = _executor.submit(execute)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        _count('timeouts')
+        outcome = 'timeout'
+        raise DeadlineExceeded(f'Query on {table} exceeded its {timeout:.2f}s deadline')
+    except Exception:
+        outcome = 'error'
+        raise
+    finally:
+        if profiling:
+            record_upstream_call(table, time.perf_counter() - started, outcome)
+
+
+def execute_resilient(execute, table, idempotent):
+    """Run one upstream call under the per-request deadline, retry policy and table breaker"""
+    breaker = get_breaker(table)
+    attempts = 1 + (Config.UPSTREAM_READ_RETRIES if idempotent else 0)
+
+    for attempt in range(attempts):
+        if not breaker.allow():
+            _count('rejected')
+            raise CircuitOpenError(f'Upstream for {table} is unavailable, try again shortly')
+
+        _count('calls')
+        try:
+            result = _call_with_deadline(execute, table)
+        except Exception as e:
+            if not _is_transient(e):
+                # Bad filters, constraint violations etc. neither open nor close the circuit
+                breaker.release_probe()
+                raise
+            breaker.record_failure()
+            _count('failures')
+
+            backoff = random.uniform(0, min(Config.UPSTREAM_RETRY_MAX_SECONDS, Config.UPSTREAM_RETRY_BASE_SECONDS * 2 ** attempt))
+            if attempt + 1 >= attempts or remaining_budget() - backoff <= 0:
+                if isinstance(e, UpstreamUnavailable):
+                    raise
+                logger.warning('upstream.failed', table=table, attempts=attempt + 1, error=str(e))
+                raise UpstreamUnavailable(f'Upstream error on {table}, try again shortly') from e
+
+            _count('retries')
+            logger.debug('upstream.retry', table=table, attempt=attempt + 1, error=str(e))
+            time.sleep(backoff)
+            continue
+
+        breaker.record_success()
+        return result
+
+
+class ResilientQuery:
+    """Wraps a postgrest request builder so execute() goes through execute_resilient"""
+
+    def __init__(self, builder, table, idempotent=None):
+        self._builder = builder
+        self._table = table
+        self._idempotent = idempotent
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return self._wrap(attr, name) if hasattr(attr, 'execute') else attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            return self._wrap(result, name) if hasattr(result, 'execute') else result
+
+        return call
+
+    def _wrap(self, builder, method):
+        idempotent = self._idempotent
+        if idempotent is None:
+            idempotent = method not in WRITE_METHODS
+        return ResilientQuery(builder, self._table, idempotent)
+
+    def execute(self):
+        return execute_resilient(self._builder.execute, self._table, bool(self._idempotent))
+
+
+class ResilientClient:
+    """Drop-in wrapper around the shared Supabase client"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name):
+        return ResilientQuery(self._client.table(name), name)
+
+    def rpc(self, fn, params=None, **kwargs):
+        # RPCs may write, so they are never retried
+        return ResilientQuery(self._client.rpc(fn, params or {}, **kwargs), f'rpc:{fn}', idempotent=False)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def error_response(e):
+    """JSON error for a failed route: 503/504 for upstream trouble, 500 otherwise"""
+    if isinstance(e, UpstreamUnavailable):
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = str(int(Config.CIRCUIT_RESET_SECONDS)) if isinstance(e, CircuitOpenError) else '1'
+        return response, e.status_code
+    return jsonify({'error': str(e)}), 500
+
+
+def upstream_metrics():
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    metrics['circuits'] = {table: breaker.snapshot() for table, breaker in list(_breakers.items())}
+    return metrics
+
+
+def init_resilience(app):
+    @app.before_request
+    def start_request_budget():
+        g.deadline = time.monotonic() + Config.REQUEST_BUDGET_SECONDS
@@ -0,0 +1,159 @@
+import heapq
+import time
+from datetime import datetime, timezone
+from config import Config
+from database import db
+from utils.cache import PINNED_PREFIX, get_shared_store
+from utils.change_feed import iso_timestamp
+from utils.structured_logging import get_logger
+from utils.trend_queries import PENDING_STATUS, format_trend_for_user, scan_trends
+
+logger = get_logger('review_queue')
+
+# Columns the ranking pass reads; full rows are only fetched for the selected batch
+PRIORITY_COLUMNS = 'id, impact_score, created_at, department_name'
+
+
+class InvalidWeights(ValueError):
+    pass
+
+
+def parse_department_weights(spec):
+    """Parse 'Research=2,Operations=0.5' into {'Research': 2.0, 'Operations': 0.5}"""
+    weights = {}
+    for part in (spec or '').split(','):
+        if '=' not in part:
+            continue
+        department, weight = part.rsplit('=', 1)
+        weights[department.strip()] = float(weight)
+    return weights
+
+
+def priority_weights(args):
+    """Configured priority weights, overridden by impact_weight/age_weight/department_weights params"""
+    try:
+        departments = parse_department_weights(Config.REVIEW_DEPARTMENT_WEIGHTS)
+        departments.update(parse_department_weights(args.get('department_weights')))
+        return {
+            'impact': float(args.get('impact_weight', Config.REVIEW_IMPACT_WEIGHT)),
+            'age': float(args.get('age_weight', Config.REVIEW_AGE_WEIGHT)),
+            'departments': departments
+        }
+    except ValueError:
+        raise InvalidWeights('Priority weights must be numbers')
+
+
+def _age_days(created_at, now):
+    if not created_at:
+        return 0.0
+    try:
+        created = datetime.fromisoformat(str(created_at).replace('Z', '+00:00'))
+    except ValueError:
+        return 0.0
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+    return max(0.0, (now - created.timestamp()) / 86400)
+
+
+def priority(row, weights, now):
+    """impact_weight * impact_score + age_weight * age in days + department weight"""
+    return (
+        weights['impact'] * (row.get('impact_score') or 0)
+        + weights['age'] * _age_days(row.get('created_at'), now)
+        + weights['departments'].get(row.get('department_name'), 0.0)
+    )
+
+
+def _lease_key(trend_id):
+    # Pinned so that cache pressure can never drop a live lease
+    return f'{PINNED_PREFIX}review:lease:{trend_id}'
+
+
+def _lease_holder(store, trend_id):
+    lease = store.get(_lease_key(trend_id))
+    return lease.get('admin_id') if lease else None
+
+
+def _claim(store, trend_id, admin_id, expires_at):
+    """Take or renew the lease on one trend; False if another admin holds it"""
+    lease = {'admin_id': admin_id, 'expires_at': expires_at}
+    if store.add(_lease_key(trend_id), lease, Config.REVIEW_LEASE_SECONDS):
+        return True
+    if _lease_holder(store, trend_id) == admin_id:
+        store.set(_lease_key(trend_id), lease, Config.REVIEW_LEASE_SECONDS)
+        return True
+    return False
+
+
+def next_batch(current_user, filters, weights, limit, claim=False):
+    """Highest-priority pending trends not leased by another admin.
+
+    Candidates are scored from a projected scan and picked with a bounded
+    top-k selection of limit + slack items; the window only widens when
+    leases held by other admins cause skips. With claim=True each returned
+    trend is leased to the caller for REVIEW_LEASE_SECONDS; expired leases
+    simply disappear from the store.
+    """
+    rows = scan_trends(PRIORITY_COLUMNS, current_user, dict(filters, status=[PENDING_STATUS]))
+
+    now = time.time()
+    store = get_shared_store()
+    admin_id = current_user['id']
+    expires_at = now + Config.REVIEW_LEASE_SECONDS
+    selected = []
+    skipped = 0
+    considered = 0
+    window = limit + max(limit, Config.REVIEW_LEASE_SLACK)
+    while len(selected) < limit and considered < len(rows):
+        # nlargest is stable, so a wider window starts with the items already considered
+        candidates = heapq.nlargest(window, rows, key=lambda row: priority(row, weights, now))
+        for row in candidates[considered:]:
+            considered += 1
+            if claim:
+                available = _claim(store, row['id'], admin_id, expires_at)
+            else:
+                available = _lease_holder(store, row['id']) in (None, admin_id)
+            if not available:
+                skipped += 1
+                continue
+            selected.append((row['id'], round(priority(row, weights, now), 4)))
+            if len(selected) >= limit:
+                break
+        window *= 2
+
+    trends = []
+    if selected:
+        full_rows = db.table('trends').select('*').in_('id', [trend_id for trend_id, _ in selected]).execute().data
+        by_id = {row['id']: row for row in full_rows}
+        for trend_id, score in selected:
+            if trend_id in by_id:
+                trend = format_trend_for_user(by_id[trend_id], current_user)
+                trend['priority'] = score
+                trends.append(trend)
+
+    return {
+        'trends': trends,
+        'pending': len(rows),
+        'leased_by_others': skipped,
+        'lease_expires_at': iso_timestamp(expires_at) if claim else None
+    }
+
+
+def release_leases(trend_ids, admin_id=None):
+    """Drop leases; with admin_id only the ones that admin holds"""
+    store = get_shared_store()
+    released = 0
+    for trend_id in trend_ids:
+        if admin_id is not None and _lease_holder(store, trend_id) != admin_id:
+            continue
+        store.delete(_lease_key(trend_id))
+        released += 1
+    return released
+
+
+def finish_review(trend_ids):
+    """Release leases on reviewed trends; never fails the review itself"""
+    try:
+        release_leases(trend_ids)
+    except Exception as e:
+        logger.warning('review_queue.release_failed', trend_ids=len(trend_ids), error=str(e))
@@ -0,0 +1,289 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from utils.cache import TieredCache
+from utils.resilience import UpstreamUnavailable
+
+
+class StatsScheduler:
+    """Keeps stats for the most requested filter keys precomputed.
+
+    Entries are keyed by (visibility scope, canonical filter key) and stored
+    in the shared 'stats' cache, so every worker on the host serves the same
+    warm values. Fresh entries are served directly; entries past the soft TTL
+    are served stale while a background refresh runs; entries past the hard
+    TTL are recomputed in the request, falling back to the expired value if
+    Supabase is unavailable. Misses take the same host-wide lock as
+    background refreshes, so one worker computes a key while the others wait
+    up to STATS_MISS_WAIT_SECONDS for its result, then fall back to the
+    expired value or the entry from before the last invalidation, and only
+    compute it themselves when there is nothing to serve. A daemon thread refreshes the hottest
+    keys before they go stale, and cold keys are evicted from the local tier
+    by (decaying) request frequency.
+    """
+
+    def __init__(self, capacity, soft_ttl, hard_ttl, precompute_top_keys,
+                 precompute_interval, refresh_workers, miss_wait):
+        self.capacity = capacity
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.precompute_top_keys = precompute_top_keys
+        self.precompute_interval = precompute_interval
+        self.miss_wait = miss_wait
+
+        self._cache = TieredCache(
+            'stats',
+            local_max_entries=max(1, capacity),
+            local_ttl=min(Config.CACHE_LOCAL_TTL_SECONDS, soft_ttl),
+            # Expired entries are kept a while longer to serve if Supabase is down
+            shared_ttl=hard_ttl + Config.STATS_STALE_IF_ERROR_SECONDS
+        )
+        self._lock = threading.Lock()
+        self._frequency = {}
+        self._computers = {}
+        self._local_keys = set()
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix='stats-refresh')
+        self._precompute_thread = None
+
+        self._metrics = {
+            'requests': 0,
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'miss_waits': 0,
+            'served_after_wait': 0,
+            'served_previous': 0,
+            'refreshes': 0,
+            'refresh_errors': 0,
+            'refreshes_skipped': 0,
+            'served_stale_on_error': 0,
+            'precomputed': 0,
+            'evictions': 0,
+            'invalidations': 0,
+            'refresh_lag_total': 0.0,
+            'refresh_lag_max': 0.0,
+            'refresh_lag_count': 0
+        }
+
+    def get(self, scope, key, compute, compute_on_miss=True):
+        """Return stats for the key, computing them on a miss unless told not to"""
+        self._ensure_precompute_thread()
+        cache_key = (scope, key)
+
+        with self._lock:
+            self._metrics['requests'] += 1
+            self._frequency[cache_key] = self._frequency.get(cache_key, 0) + 1
+            self._computers[cache_key] = compute
+            self._trim_tracked_keys()
+
+        entry = self._cache.get(self._cache_id(cache_key))
+        if entry is not None:
+            age = time.time() - entry['computed_at']
+
+            if age < self.soft_ttl:
+                self._count('hits')
+                return entry['stats']
+
+            if age < self.hard_ttl:
+                self._count('stale_hits')
+                with self._lock:
+                    self._schedule_refresh(cache_key, entry['computed_at'] + self.soft_ttl)
+                return entry['stats']
+
+        self._count('misses')
+
+        if not compute_on_miss:
+            return None
+
+        # Only one worker on the host computes a missing key; the rest wait for it
+        cache_id = self._cache_id(cache_key)
+        lock_name = f'refresh:{cache_id}'
+        locked = self._cache.acquire(lock_name, ttl=max(1.0, self.soft_ttl))
+        if not locked:
+            fallback = entry or self._cache.get_previous(cache_id)
+            waited = self._wait_for(cache_id)
+            if waited is not None:
+                self._count('served_after_wait')
+                return waited['stats']
+            if fallback is not None:
+                self._count('served_previous')
+                return fallback['stats']
+
+        try:
+            version = self.current_version()
+            try:
+                stats = compute()
+            except UpstreamUnavailable:
+                if entry is None:
+                    raise
+                # Upstream is timing out or its circuit is open: expired stats beat an error
+                self._count('served_stale_on_error')
+                return entry['stats']
+            self.store(scope, key, stats, version=version)
+            return stats
+        finally:
+            if locked:
+                self._cache.release(lock_name)
+
+    def current_version(self):
+        """Cache version to capture before computing a value passed to store()"""
+        return self._cache.version()
+
+    def store(self, scope, key, stats, version=None):
+        """Insert freshly computed stats, evicting the coldest local key if full"""
+        cache_key = (scope, key)
+        self._cache.set(self._cache_id(cache_key), {'stats': stats, 'computed_at': time.time()}, version=version)
+        with self._lock:
+            self._local_keys.add(cache_key)
+            self._evict_if_full(keep=cache_key)
+
+    def invalidate(self):
+        """Drop every cached value in all workers; request frequencies are kept"""
+        self._cache.invalidate()
+        self._count('invalidations')
+
+    def metrics(self):
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['local_entries'] = len(self._local_keys)
+            metrics['tracked_keys'] = len(self._frequency)
+
+        served = metrics['hits'] + metrics['stale_hits']
+        metrics['hit_ratio'] = served / metrics['requests'] if metrics['requests'] else 0.0
+        lag_count = metrics.pop('refresh_lag_count')
+        lag_total = metrics.pop('refresh_lag_total')
+        metrics['refresh_lag_avg'] = lag_total / lag_count if lag_count else 0.0
+        return metrics
+
+    def _cache_id(self, cache_key):
+        return f'{cache_key[0]}|{cache_key[1]}'
+
+    def _count(self, name):
+        with self._lock:
+            self._metrics[name] += 1
+
+    def _wait_for(self, cache_id):
+        """Poll for an entry another worker is computing; None if it is not fresh in time"""
+        self._count('miss_waits')
+        deadline = time.monotonic() + self.miss_wait
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = self._cache.get(cache_id)
+            if entry is not None and time.time() - entry['computed_at'] < self.hard_ttl:
+                return entry
+        return None
+
+    def _schedule_refresh(self, cache_key, stale_since):
+        # Caller holds the lock
+        if cache_key in self._refreshing:
+            return
+        compute = self._computers.get(cache_key)
+        if compute is None:
+            return
+        self._refreshing.add(cache_key)
+        self._executor.submit(self._refresh, cache_key, compute, stale_since)
+
+    def _refresh(self, cache_key, compute, stale_since):
+        cache_id = self._cache_id(cache_key)
+        try:
+            # Only one worker on the host refreshes a given key at a time
+            if not self._cache.acquire(f'refresh:{cache_id}', ttl=max(1.0, self.soft_ttl)):
+                self._count('refreshes_skipped')
+                return
+            try:
+                version = self.current_version()
+                stats = compute()
+                self.store(cache_key[0], cache_key[1], stats, version=version)
+            finally:
+                self._cache.release(f'refresh:{cache_id}')
+        except Exception:
+            self._count('refresh_errors')
+            return
+        finally:
+            with self._lock:
+                self._refreshing.discard(cache_key)
+
+        with self._lock:
+            self._metrics['refreshes'] += 1
+            if stale_since is not None:
+                lag = max(0.0, time.time() - stale_since)
+                self._metrics['refresh_lag_total'] += lag
+                self._metrics['refresh_lag_count'] += 1
+                self._metrics['refresh_lag_max'] = max(self._metrics['refresh_lag_max'], lag)
+
+    def _evict_if_full(self, keep):
+        # Caller holds the lock
+        while len(self._local_keys) > self.capacity:
+            candidates = [k for k in self._local_keys if k != keep] or [keep]
+            coldest = min(candidates, key=lambda k: self._frequency.get(k, 0))
+            self._local_keys.discard(coldest)
+            self._cache.discard_local(self._cache_id(coldest))
+            self._metrics['evictions'] += 1
+
+    def _trim_tracked_keys(self):
+        # Caller holds the lock. Bound the frequency table to a few times the capacity.
+        limit = self.capacity * 4
+        if len(self._frequency) <= limit:
+            return
+        for cache_key in sorted(self._frequency, key=self._frequency.get)[:len(self._frequency) - limit]:
+            if cache_key in self._local_keys:
+                continue
+            self._frequency.pop(cache_key, None)
+            self._computers.pop(cache_key, None)
+
+    def _ensure_precompute_thread(self):
+        if self.precompute_interval <= 0 or self._precompute_thread is not None:
+            return
+        with self._lock:
+            if self._precompute_thread is not None:
+                return
+            self._precompute_thread = threading.Thread(
+                target=self._precompute_loop, name='stats-precompute', daemon=True
+            )
+            self._precompute_thread.start()
+
+    def _precompute_loop(self):
+        while True:
+            time.sleep(self.precompute_interval)
+            try:
+                self._precompute_hot_keys()
+            except Exception:
+                # Never let one bad pass stop precomputation for the worker
+                continue
+
+    def _precompute_hot_keys(self):
+        with self._lock:
+            hot_keys = sorted(self._frequency, key=self._frequency.get, reverse=True)[:self.precompute_top_keys]
+            hot_keys = [cache_key for cache_key in hot_keys if self._frequency[cache_key] > 0]
+
+        now = time.time()
+        for cache_key in hot_keys:
+            entry = self._cache.get(self._cache_id(cache_key))
+            # Refresh anything that would go stale before the next pass
+            if entry is None or now - entry['computed_at'] >= self.soft_ttl - self.precompute_interval:
+                stale_since = entry['computed_at'] + self.soft_ttl if entry else None
+                with self._lock:
+                    if cache_key not in self._refreshing:
+                        self._metrics['precomputed'] += 1
+                    self._schedule_refresh(cache_key, stale_since if stale_since and stale_since < now else None)
+
+        with self._lock:
+            # Age the counters so keys that were popular a while ago cool down
+            for cache_key in list(self._frequency):
+                self._frequency[cache_key] //= 2
+                if self._frequency[cache_key] == 0 and cache_key not in self._local_keys:
+                    del self._frequency[cache_key]
+                    self._computers.pop(cache_key, None)
+
+
+stats_scheduler = StatsScheduler(
+    capacity=Config.STATS_CACHE_CAPACITY,
+    soft_ttl=Config.STATS_CACHE_SOFT_TTL_SECONDS,
+    hard_ttl=Config.STATS_CACHE_HARD_TTL_SECONDS,
+    precompute_top_keys=Config.STATS_PRECOMPUTE_TOP_KEYS,
+    precompute_interval=Config.STATS_PRECOMPUTE_INTERVAL_SECONDS,
+    refresh_workers=Config.STATS_REFRESH_WORKERS,
+    miss_wait=Config.STATS_MISS_WAIT_SECONDS
+)
@@ -0,0 +1,185 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, has_request_context, request
+from config import Config
+
+LOGGER_NAME = 'trends'
+
+_metrics_lock = threading.Lock()
+_metrics = {
+    'emitted': 0,
+    'enqueued': 0,
+    'dropped': 0,
+    'sampled_out': 0,
+    'enqueue_seconds_total': 0.0,
+    'enqueue_seconds_max': 0.0
+}
+
+_queue = None
+_listener = None
+
+
+def _record_metric(name, value=1):
+    with _metrics_lock:
+        _metrics[name] += value
+
+
+def parse_sample_rates(spec):
+    """Parse 'DEBUG=0.1,INFO=1' into {logging.DEBUG: 0.1, logging.INFO: 1.0}"""
+    rates = {}
+    for part in (spec or '').split(','):
+        if '=' not in part:
+            continue
+        level_name, rate = part.split('=', 1)
+        level = logging.getLevelName(level_name.strip().upper())
+        if isinstance(level, int):
+            rates[level] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of records per level; WARNING and above are never sampled"""
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(record.levelno, 1.0)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        _record_metric('sampled_out')
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the listener thread and drops them when the queue is full.
+
+    Only the cheap part of the work (resolving the message and capturing the
+    request id, which lives in the request thread) happens in the caller;
+    JSON encoding and the stdout write happen on the listener thread.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        if not hasattr(record, 'request_id'):
+            record.request_id = current_request_id()
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _record_metric('dropped')
+        else:
+            _record_metric('enqueued')
+
+    def emit(self, record):
+        started = time.perf_counter()
+        super().emit(record)
+        elapsed = time.perf_counter() - started
+        with _metrics_lock:
+            _metrics['emitted'] += 1
+            _metrics['enqueue_seconds_total'] += elapsed
+            _metrics['enqueue_seconds_max'] = max(_metrics['enqueue_seconds_max'], elapsed)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the event name and its structured fields"""
+
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'event': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None)
+        }
+        payload.update(getattr(record, 'fields', None) or {})
+        if record.exc_text:
+            payload['exception'] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """Logger adapter that turns keyword arguments into structured fields.
+
+    logger.info('trends.bulk_approved', approved=3, requested=4)
+    """
+
+    RESERVED_KWARGS = ('exc_info', 'stack_info', 'stacklevel', 'extra')
+
+    def process(self, msg, kwargs):
+        fields = {key: kwargs.pop(key) for key in list(kwargs) if key not in self.RESERVED_KWARGS}
+        extra = dict(kwargs.get('extra') or {})
+        extra['fields'] = fields
+        kwargs['extra'] = extra
+        return msg, kwargs
+
+
+def get_logger(name):
+    return StructuredLogger(logging.getLogger(f'{LOGGER_NAME}.{name}'), {})
+
+
+def current_request_id():
+    if has_request_context():
+        return g.get('request_id')
+    return None
+
+
+def logging_metrics():
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    metrics['queue_depth'] = _queue.qsize() if _queue is not None else 0
+    enqueue_total = metrics.pop('enqueue_seconds_total')
+    metrics['enqueue_seconds_avg'] = enqueue_total / metrics['emitted'] if metrics['emitted'] else 0.0
+    return metrics
+
+
+def init_logging(app):
+    """Route the app's loggers through a bounded queue to a JSON stdout writer"""
+    global _queue, _listener
+
+    if _listener is None:
+        _queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(JsonFormatter())
+        _listener = QueueListener(_queue, stream_handler, respect_handler_level=False)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        queue_handler = NonBlockingQueueHandler(_queue)
+        queue_handler.addFilter(SamplingFilter(parse_sample_rates(Config.LOG_SAMPLE_RATES)))
+
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.setLevel(Config.LOG_LEVEL)
+        logger.addHandler(queue_handler)
+        logger.propagate = False
+
+    @app.before_request
+    def assign_request_id():
+        g.request_id = request.headers.get('X-Request-ID', '')[:64] or uuid.uuid4().hex
+
+    @app.after_request
+    def expose_request_id(response):
+        request_id = g.get('request_id')
+        if request_id:
+            response.headers['X-Request-ID'] = request_id
+        return response
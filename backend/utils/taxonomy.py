@@ -0,0 +1,170 @@
+import threading
+from config import Config
+from database import db
+from utils.cache import TieredCache
+from utils.resilience import UpstreamUnavailable
+from utils.structured_logging import get_logger
+
+logger = get_logger('taxonomy')
+
+# Trend filter field -> (taxonomy table, name column)
+TAXONOMY_FIELDS = {
+    'department_name': ('departments', 'name'),
+    'category': ('categories', 'category_name'),
+    'sub_category': ('sub_categories', 'sub_category_name')
+}
+
+
+class InvalidFilter(ValueError):
+    pass
+
+
+def _normalise(value):
+    return ' '.join(str(value).split()).casefold()
+
+
+class TaxonomyIndex:
+    """Departments, categories and subcategories loaded once and indexed in memory.
+
+    The raw tables live in the shared 'taxonomy' cache for TAXONOMY_TTL_SECONDS,
+    so a refresh is one set of three queries per host rather than per worker.
+    Lookup maps are rebuilt only when a different snapshot comes back.
+    """
+
+    def __init__(self, ttl):
+        self._cache = TieredCache(
+            'taxonomy',
+            local_max_entries=1,
+            local_ttl=min(Config.CACHE_LOCAL_TTL_SECONDS, ttl),
+            shared_ttl=ttl
+        )
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._index = None
+
+    def _load(self):
+        tables = self._cache.get('tables')
+        if tables is not None:
+            return tables
+
+        version = self._cache.version()
+        tables = {
+            table: db.table(table).select('*').execute().data
+            for table in ('departments', 'categories', 'sub_categories')
+        }
+        self._cache.set('tables', tables, version=version)
+        return tables
+
+    def _build(self, tables):
+        canonical = {}
+        for field, (table, column) in TAXONOMY_FIELDS.items():
+            canonical[field] = {
+                _normalise(row[column]): row[column] for row in tables[table] if row.get(column)
+            }
+
+        subcategories_by_category = {}
+        for row in tables['sub_categories']:
+            subcategories_by_category.setdefault(row.get('category_name'), []).append(row)
+
+        categories_by_department = {}
+        for row in tables['categories']:
+            categories_by_department.setdefault(row.get('department'), []).append(row)
+
+        return {
+            'tables': tables,
+            'canonical': canonical,
+            'subcategories_by_category': subcategories_by_category,
+            'categories_by_department': categories_by_department
+        }
+
+    def index(self):
+        tables = self._load()
+        with self._lock:
+            if tables is not self._snapshot:
+                self._index = self._build(tables)
+                self._snapshot = tables
+            return self._index
+
+    def departments(self, active_only=False):
+        rows = self.index()['tables']['departments']
+        return [row for row in rows if row.get('is_active')] if active_only else rows
+
+    def categories(self, department=None):
+        index = self.index()
+        if department is None:
+            return index['tables']['categories']
+        return index['categories_by_department'].get(department, [])
+
+    def subcategories(self, category_name=None):
+        index = self.index()
+        if category_name is None:
+            return index['tables']['sub_categories']
+        return index['subcategories_by_category'].get(category_name, [])
+
+    def expand_category(self, category):
+        """Subcategory names under a category (matched like a filter value)"""
+        name = self.index()['canonical']['category'].get(_normalise(category))
+        if name is None:
+            raise InvalidFilter(f'Unknown category: {category}')
+        return [row['sub_category_name'] for row in self.subcategories(name)]
+
+    def tree(self, active_only=False):
+        """Departments -> categories -> subcategories in one nested structure"""
+        tree = []
+        for department in self.departments(active_only):
+            categories = []
+            for category in self.categories(department.get('name')):
+                categories.append(dict(category, subcategories=self.subcategories(category.get('category_name'))))
+            tree.append(dict(department, categories=categories))
+        return tree
+
+    def _canonicalise(self, canonical, filters):
+        """(normalised filters, first field with unknown values, those values)"""
+        normalised = dict(filters)
+        for field in TAXONOMY_FIELDS:
+            if field not in filters:
+                continue
+            names = []
+            unknown = []
+            for value in filters[field]:
+                name = canonical[field].get(_normalise(value))
+                if name is None:
+                    unknown.append(value)
+                elif name not in names:
+                    names.append(name)
+            if unknown:
+                return normalised, field, unknown
+            normalised[field] = names
+        return normalised, None, None
+
+    def normalise_filters(self, filters):
+        """Map taxonomy filter values to their canonical names; InvalidFilter for unknown ones.
+
+        An unknown value may be one added since the snapshot was cached, so
+        the taxonomy is reloaded once before rejecting it. Forced reloads are
+        limited to one per TAXONOMY_RELOAD_INTERVAL_SECONDS per host; within
+        that window a worker re-reads whatever snapshot is current. If the
+        taxonomy cannot be loaded, filters pass through unchanged so reads
+        keep working without validation.
+        """
+        try:
+            normalised, field, unknown = self._canonicalise(self.index()['canonical'], filters)
+            if unknown:
+                # The lock is left to expire, so it doubles as the reload rate limit
+                if self._cache.acquire('reload', Config.TAXONOMY_RELOAD_INTERVAL_SECONDS):
+                    logger.info('taxonomy.reload', field=field)
+                    self._cache.invalidate()
+                normalised, field, unknown = self._canonicalise(self.index()['canonical'], filters)
+        except UpstreamUnavailable as e:
+            logger.warning('taxonomy.unavailable', error=str(e))
+            return filters
+
+        if unknown:
+            raise InvalidFilter(f"Unknown {field.replace('_', ' ')}: {', '.join(unknown)}")
+        return normalised
+
+    def invalidate(self):
+        self._cache.invalidate()
+
+
+taxonomy_index = TaxonomyIndex(Config.TAXONOMY_TTL_SECONDS)
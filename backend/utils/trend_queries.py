@@ -0,0 +1,244 @@
+from flask import request
+from config import Config
+from database import db
+
+# Only load complete trends: at least one description field must be non-empty
+COMPLETE_DESCRIPTION_FILTER = 'internal_teacher_description.neq.,internal_business_description.neq.,external_user_description.neq.'
+
+# The description columns the completeness filter looks at
+DESCRIPTION_FIELDS = ['internal_teacher_description', 'internal_business_description', 'external_user_description']
+
+# Filter dimensions accepted by the trend list and dashboard endpoints
+TREND_FILTER_FIELDS = [
+    'department_name',
+    'category',
+    'sub_category',
+    'time_horizon',
+    'scope',
+    'status',
+    'impact_label'
+]
+
+# Status of trends waiting for admin review
+PENDING_STATUS = 'draft'
+
+# The stats endpoint has always ignored time horizon, scope and status
+STATS_FILTER_FIELDS = ['department_name', 'category', 'sub_category', 'impact_label']
+
+# Columns the stats aggregation reads; stats scans project only these
+STATS_COLUMNS = 'id, title, impact_score, category, department_name'
+
+# Columns needed to decide which stats buckets and filter views a row belongs to
+CHANGE_COLUMNS = 'id, status, category, department_name, sub_category, time_horizon, scope, impact_label, impact_score, reviewed_at, reviewed_by, ' + ', '.join(DESCRIPTION_FIELDS)
+
+# sub_category is an array column and needs containment/overlap operators
+ARRAY_FILTER_FIELDS = {'sub_category'}
+
+
+def parse_trend_filters(args=None, fields=TREND_FILTER_FIELDS):
+    """Collect the multi-value filters from the query string as {field: [values]}"""
+    if args is None:
+        args = request.args
+
+    filters = {}
+    for field in fields:
+        values = [value for value in args.getlist(field) if value != '']
+        if values:
+            filters[field] = values
+    return filters
+
+
+def filter_key(filters):
+    """Canonical, order-independent key for a filter set"""
+    parts = []
+    for field in sorted(filters):
+        values = sorted(set(filters[field]))
+        parts.append(f"{field}={','.join(values)}")
+    return '&'.join(parts)
+
+
+def visibility_scope(current_user):
+    """Admins see every trend, all other roles only see confirmed trends"""
+    return 'admin' if current_user['user_type'] == 'admin' else 'confirmed'
+
+
+def apply_trend_filters(query, current_user, filters):
+    """Apply the completeness, visibility and user filters to a trends query"""
+    query = query.or_(COMPLETE_DESCRIPTION_FILTER)
+
+    # Non-admin users can only see confirmed trends
+    if current_user['user_type'] != 'admin':
+        query = query.eq('status', 'confirmed')
+
+    for field, values in filters.items():
+        if field in ARRAY_FILTER_FIELDS:
+            if len(values) == 1:
+                query = query.contains(field, [values[0]])
+            else:
+                query = query.overlaps(field, values)
+        elif len(values) == 1:
+            query = query.eq(field, values[0])
+        else:
+            query = query.in_(field, values)
+
+    return query
+
+
+def is_complete(row):
+    """In-memory counterpart of COMPLETE_DESCRIPTION_FILTER (NULL never matches neq)"""
+    return any(row.get(field) not in (None, '') for field in DESCRIPTION_FIELDS)
+
+
+def row_matches_filters(row, current_user, filters):
+    """In-memory counterpart of apply_trend_filters for a single row"""
+    if not is_complete(row):
+        return False
+
+    if current_user['user_type'] != 'admin' and row.get('status') != 'confirmed':
+        return False
+
+    for field, values in filters.items():
+        if field in ARRAY_FILTER_FIELDS:
+            if not set(row.get(field) or []) & set(values):
+                return False
+        elif row.get(field) not in values:
+            return False
+
+    return True
+
+
+def format_trend_for_user(trend, current_user):
+    """Expose only the description that matches the user's type"""
+    filtered_trend = trend.copy()
+
+    if current_user['user_type'] == 'admin':
+        # Admin sees all descriptions
+        filtered_trend['descriptions'] = {
+            'internal_teacher': trend.get('internal_teacher_description'),
+            'internal_business': trend.get('internal_business_description'),
+            'external': trend.get('external_user_description')
+        }
+    elif current_user['user_type'] == 'internal_teacher':
+        filtered_trend['description'] = trend.get('internal_teacher_description')
+    elif current_user['user_type'] == 'internal_business':
+        filtered_trend['description'] = trend.get('internal_business_description')
+    elif current_user['user_type'] == 'external':
+        filtered_trend['description'] = trend.get('external_user_description')
+
+    # Remove individual description fields
+    if current_user['user_type'] != 'admin':
+        filtered_trend.pop('internal_teacher_description', None)
+        filtered_trend.pop('internal_business_description', None)
+        filtered_trend.pop('external_user_description', None)
+
+    return filtered_trend
+
+
+def impact_bucket(impact_score):
+    """Map an impact score to the high/medium/low stats bucket"""
+    impact_score = impact_score or 0
+    if impact_score >= 7:
+        return 'high'
+    if impact_score >= 4:
+        return 'medium'
+    return 'low'
+
+
+def compute_trend_stats(trends):
+    """Aggregate the dashboard statistics in a single pass over the rows"""
+    stats = {
+        'total_trends': len(trends),
+        'by_category': {},
+        'by_department': {},
+        'by_impact': {
+            'high': 0,
+            'medium': 0,
+            'low': 0
+        },
+        'top_growing': [],
+        'highest_impact': []
+    }
+
+    for trend in trends:
+        # Count by category
+        category = trend.get('category', 'Unknown')
+        stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
+
+        # Count by department
+        department = trend.get('department_name', 'Unknown')
+        stats['by_department'][department] = stats['by_department'].get(department, 0) + 1
+
+        # Count by impact
+        stats['by_impact'][impact_bucket(trend.get('impact_score', 0))] += 1
+
+    # Get highest impact trends (top 5)
+    sorted_by_impact = sorted(trends, key=lambda x: x.get('impact_score') or 0, reverse=True)[:5]
+    stats['highest_impact'] = [
+        {
+            'id': t['id'],
+            'title': t['title'],
+            'impact_score': t.get('impact_score', 0),
+            'category': t.get('category')
+        }
+        for t in sorted_by_impact
+    ]
+
+    return stats
+
+
+def stats_delta(before_rows, after_rows, current_user, filters):
+    """Change in the counted stats when before_rows become after_rows (None = deleted).
+
+    highest_impact is not additive and is not part of the delta.
+    """
+    delta = {'total_trends': 0, 'by_category': {}, 'by_department': {}, 'by_impact': {}}
+
+    def apply(row, sign):
+        if row is None or not row_matches_filters(row, current_user, filters):
+            return
+        delta['total_trends'] += sign
+        for bucket, value in (
+            ('by_category', row.get('category', 'Unknown')),
+            ('by_department', row.get('department_name', 'Unknown')),
+            ('by_impact', impact_bucket(row.get('impact_score', 0)))
+        ):
+            delta[bucket][value] = delta[bucket].get(value, 0) + sign
+            if delta[bucket][value] == 0:
+                del delta[bucket][value]
+
+    for before, after in zip(before_rows, after_rows):
+        apply(before, -1)
+        apply(after, 1)
+
+    return delta
+
+
+def scan_trends(columns, current_user, filters):
+    """Every matching row, read in SCAN_PAGE_SIZE pages so PostgREST's max-rows cap can't truncate it"""
+    rows = []
+    offset = 0
+    page_size = Config.SCAN_PAGE_SIZE
+    while True:
+        query = apply_trend_filters(db.table('trends').select(columns), current_user, filters)
+        page = query.order('id').range(offset, offset + page_size - 1).execute().data
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        offset += page_size
+
+
+def fetch_trend_stats(current_user, filters):
+    """Run a projected stats scan for the filters and aggregate it"""
+    return compute_trend_stats(scan_trends(STATS_COLUMNS, current_user, filters))
+
+
+def fetch_trend_page(current_user, filters, page, limit):
+    """One page of trends (newest first) and the exact total count, as raw rows"""
+    offset = (page - 1) * limit
+
+    # The exact count comes back with the page in the same round trip
+    query = apply_trend_filters(db.table('trends').select('*', count='exact'), current_user, filters)
+    response = query.order('created_at', desc=True).range(offset, offset + limit - 1).execute()
+
+    total_count = response.count if response.count is not None else len(response.data)
+    return {'rows': response.data, 'total': total_count}
@@ -3,7 +3,7 @@ import axios from 'axios';
 import { useAuth } from '../context/AuthContext';
 import './TrendDetailPanel.css';
 
-const TrendDetailPanel = ({ trend, onClose, isAdmin, onApprove, onDisapprove }) => {
+const TrendDetailPanel = ({ trend, onClose, isAdmin, onApprove, onDisapprove, filterQuery = '' }) => {
   const { API_URL } = useAuth();
   const [relatedTrends, setRelatedTrends] = useState([]);
   const [currentTrend, setCurrentTrend] = useState(trend);
@@ -183,8 +183,9 @@ const TrendDetailPanel = ({ trend, onClose, isAdmin, onApprove, onDisapprove })
   const handleApprove = async () => {
     try {
       const token = localStorage.getItem('token');
-      await axios.put(
-        `${API_URL}/api/trends/${trend.id}/approve`,
+      // The active filters let the server compute the stats delta for this view
+      const response = await axios.put(
+        `${API_URL}/api/trends/${trend.id}/approve${filterQuery ? `?${filterQuery}` : ''}`,
         {},
         {
           headers: {
@@ -192,7 +193,7 @@ const TrendDetailPanel = ({ trend, onClose, isAdmin, onApprove, onDisapprove })
           }
         }
       );
-      onApprove();
+      onApprove(response.data);
       onClose();
     } catch (error) {
       console.error('Error approving trend:', error);
@@ -206,15 +207,15 @@ const TrendDetailPanel = ({ trend, onClose, isAdmin, onApprove, onDisapprove })
 
     try {
       const token = localStorage.getItem('token');
-      await axios.delete(
-        `${API_URL}/api/trends/${trend.id}/disapprove`,
+      const response = await axios.delete(
+        `${API_URL}/api/trends/${trend.id}/disapprove${filterQuery ? `?${filterQuery}` : ''}`,
         {
           headers: {
             Authorization: `Bearer ${token}`
           }
         }
       );
-      onDisapprove();
+      onDisapprove(response.data);
       onClose();
     } catch (error) {
       console.error('Error disapproving trend:', error);
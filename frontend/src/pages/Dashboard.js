@@ -104,11 +104,13 @@ const Dashboard = ({ showToast }) => {
   const [departments, setDepartments] = useState([]);
   const [categories, setCategories] = useState([]);
   const [subcategories, setSubcategories] = useState([]);
+  // Change-feed position of the loaded view; null means the next mutation refetches
+  const cursorRef = useRef(null);
 
   useEffect(() => {
     const initData = async () => {
       await fetchInitialData();
-      await Promise.all([fetchTrends(), fetchStats()]);
+      await fetchDashboard();
       setInitialLoading(false);
     };
     initData();
@@ -117,8 +119,7 @@ const Dashboard = ({ showToast }) => {
 
   useEffect(() => {
     if (!initialLoading) {
-      fetchTrends();
-      fetchStats();
+      fetchDashboard();
     }
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [filters, currentPage, itemsPerPage]);
@@ -128,55 +129,58 @@ const Dashboard = ({ showToast }) => {
       const token = localStorage.getItem('token');
       const headers = { Authorization: `Bearer ${token}` };
 
-      const [depsRes, catsRes, subcatsRes] = await Promise.all([
-        axios.get(`${API_URL}/api/departments?active_only=true`, { headers }),
-        axios.get(`${API_URL}/api/categories`, { headers }),
-        axios.get(`${API_URL}/api/subcategories`, { headers })
-      ]);
+      // Whole taxonomy in one call
+      const response = await axios.get(`${API_URL}/api/taxonomy?active_only=true`, { headers });
 
-      setDepartments(depsRes.data.departments);
-      setCategories(catsRes.data.categories);
-      setSubcategories(subcatsRes.data.subcategories);
+      setDepartments(response.data.departments);
+      setCategories(response.data.categories);
+      setSubcategories(response.data.subcategories);
     } catch (error) {
       console.error('Error fetching initial data:', error);
     }
   };
 
-  const fetchTrends = async () => {
+  const buildFilterParams = () => {
+    const params = new URLSearchParams();
+    
+    // Add filter params - handle arrays for multi-select
+    Object.keys(filters).forEach(key => {
+      const value = filters[key];
+      if (Array.isArray(value) && value.length > 0) {
+        // For array filters, append each value
+        value.forEach(v => params.append(key, v));
+      } else if (value && !Array.isArray(value)) {
+        // For non-array filters (backwards compatibility)
+        params.append(key, value);
+      }
+    });
+    return params;
+  };
+
+  const fetchDashboard = async () => {
     try {
       // Only show loading indicator if not initial loading
       if (!initialLoading) {
         setLoading(true);
       }
       const token = localStorage.getItem('token');
-      const params = new URLSearchParams();
+      const headers = { Authorization: `Bearer ${token}` };
+      const params = buildFilterParams();
       
       // Add pagination params
       params.append('page', currentPage);
       params.append('limit', itemsPerPage);
-      
-      // Add filter params - handle arrays for multi-select
-      Object.keys(filters).forEach(key => {
-        const value = filters[key];
-        if (Array.isArray(value) && value.length > 0) {
-          // For array filters, append each value
-          value.forEach(v => params.append(key, v));
-        } else if (value && !Array.isArray(value)) {
-          // For non-array filters (backwards compatibility)
-          params.append(key, value);
-        }
-      });
 
-      const response = await axios.get(`${API_URL}/api/trends?${params}`, {
-        headers: {
-          Authorization: `Bearer ${token}`
-        }
-      });
+      // Page, total, stats and the change-feed cursor come back together
+      const response = await axios.get(`${API_URL}/api/dashboard?${params}`, { headers });
+      // Mutations patch the view from the change feed starting at this cursor
+      cursorRef.current = response.data.cursor || null;
 
       setTrends(response.data.trends);
       setTotalTrends(response.data.total || response.data.trends.length);
+      setStats(response.data.stats);
     } catch (error) {
-      console.error('Error fetching trends:', error);
+      console.error('Error fetching dashboard:', error);
     } finally {
       if (!initialLoading) {
         setLoading(false);
@@ -184,30 +188,69 @@ const Dashboard = ({ showToast }) => {
     }
   };
 
-  const fetchStats = async () => {
-    try {
-      const token = localStorage.getItem('token');
-      const params = new URLSearchParams();
-      
-      // Handle array-based filters for multi-select
-      Object.keys(filters).forEach(key => {
-        const value = filters[key];
-        if (Array.isArray(value) && value.length > 0) {
-          value.forEach(v => params.append(key, v));
-        } else if (value && !Array.isArray(value)) {
-          params.append(key, value);
-        }
+  const applyStatsDelta = (delta, deletedIds) => {
+    setStats(prev => {
+      if (!prev) return prev;
+      const next = { ...prev, total_trends: prev.total_trends + (delta.total_trends || 0) };
+      ['by_category', 'by_department', 'by_impact'].forEach(bucket => {
+        const counts = { ...(prev[bucket] || {}) };
+        Object.entries(delta[bucket] || {}).forEach(([key, change]) => {
+          counts[key] = (counts[key] || 0) + change;
+          if (counts[key] <= 0 && bucket !== 'by_impact') delete counts[key];
+        });
+        next[bucket] = counts;
       });
+      // highest_impact is not part of the delta; just drop deleted trends from it
+      next.highest_impact = (prev.highest_impact || []).filter(t => !deletedIds.includes(t.id));
+      return next;
+    });
+    setTotalTrends(prev => Math.max(0, prev + (delta.total_trends || 0)));
+  };
 
-      const response = await axios.get(`${API_URL}/api/trends/stats?${params}`, {
-        headers: {
-          Authorization: `Bearer ${token}`
-        }
-      });
+  const syncChanges = async () => {
+    const token = localStorage.getItem('token');
+    const params = buildFilterParams();
+    params.append('since', cursorRef.current);
 
-      setStats(response.data.stats);
+    const response = await axios.get(`${API_URL}/api/trends/changes?${params}`, {
+      headers: { Authorization: `Bearer ${token}` }
+    });
+    const { cursor, inserted, updated, deleted, reset } = response.data;
+    if (reset) {
+      await fetchDashboard();
+      return;
+    }
+
+    const updatesById = Object.fromEntries(updated.map(change => [change.id, change]));
+    const statusFilter = filters.status || [];
+    setTrends(prev => {
+      const insertedIds = inserted.map(trend => trend.id);
+      const kept = prev
+        .filter(trend => !deleted.includes(trend.id) && !insertedIds.includes(trend.id))
+        .map(trend => (updatesById[trend.id] ? { ...trend, ...updatesById[trend.id] } : trend))
+        .filter(trend => statusFilter.length === 0 || statusFilter.includes(trend.status));
+      // New trends sort first, so they only show up on the first page
+      const merged = currentPage === 1 ? [...inserted, ...kept] : kept;
+      return merged.slice(0, itemsPerPage);
+    });
+    cursorRef.current = cursor;
+  };
+
+  // Patch trends and stats from a mutation response instead of refetching everything
+  const applyMutation = async (data, deletedIds = []) => {
+    const previousCursor = cursorRef.current;
+    if (!data?.cursor || !previousCursor) {
+      await fetchDashboard();
+      return;
+    }
+    if (data.stats_delta) {
+      applyStatsDelta(data.stats_delta, deletedIds);
+    }
+    try {
+      await syncChanges();
     } catch (error) {
-      console.error('Error fetching stats:', error);
+      console.error('Error syncing changes:', error);
+      await fetchDashboard();
     }
   };
 
@@ -241,7 +284,7 @@ const Dashboard = ({ showToast }) => {
       console.log('Approving trends:', selectedTrends);
       
       const response = await axios.put(
-        `${API_URL}/api/trends/bulk-approve`,
+        `${API_URL}/api/trends/bulk-approve?${buildFilterParams()}`,
         { trend_ids: selectedTrends },
         {
           headers: {
@@ -254,9 +297,8 @@ const Dashboard = ({ showToast }) => {
       showToast(`Successfully approved ${selectedTrends.length} trend(s)!`, 'success');
       setSelectedTrends([]);
       
-      // Refresh data to show updated status
-      await fetchTrends();
-      await fetchStats();
+      // Patch the view with the new status
+      await applyMutation(response.data);
     } catch (error) {
       console.error('Error approving trends:', error);
       console.error('Error response:', error.response?.data);
@@ -273,8 +315,9 @@ const Dashboard = ({ showToast }) => {
       const token = localStorage.getItem('token');
       console.log('Disapproving trends:', selectedTrends);
       
-      await axios.delete(
-        `${API_URL}/api/trends/bulk-disapprove`,
+      const deletedIds = selectedTrends;
+      const response = await axios.delete(
+        `${API_URL}/api/trends/bulk-disapprove?${buildFilterParams()}`,
         {
           data: { trend_ids: selectedTrends },
           headers: {
@@ -286,9 +329,8 @@ const Dashboard = ({ showToast }) => {
       showToast(`Successfully deleted ${selectedTrends.length} trend(s)!`, 'success');
       setSelectedTrends([]);
       
-      // Refresh data to show updated list
-      await fetchTrends();
-      await fetchStats();
+      // Patch the view without the deleted trends
+      await applyMutation(response.data, deletedIds);
     } catch (error) {
       console.error('Error disapproving trends:', error);
       console.error('Error response:', error.response?.data);
@@ -375,14 +417,13 @@ const Dashboard = ({ showToast }) => {
           trend={selectedTrend}
           onClose={handleCloseTrendDetail}
           isAdmin={user?.user_type === 'admin'}
-          onApprove={async () => {
-            await fetchTrends();
-            await fetchStats();
+          filterQuery={buildFilterParams().toString()}
+          onApprove={async (data) => {
+            await applyMutation(data);
             showToast('Trend approved successfully!', 'success');
           }}
-          onDisapprove={async () => {
-            await fetchTrends();
-            await fetchStats();
+          onDisapprove={async (data) => {
+            await applyMutation(data, [selectedTrend.id]);
             showToast('Trend deleted successfully!', 'success');
           }}
         />